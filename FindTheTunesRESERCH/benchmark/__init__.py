@@ -0,0 +1,6 @@
+"""
+Локальный заменитель сайта поиска и бенчмарки FindTheTunesRESERCH.
+
+Запуск из папки FindTheTunesRESERCH:
+    python -m benchmark.run --tracks 200 --backends http selenium
+"""
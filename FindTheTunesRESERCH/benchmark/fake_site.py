@@ -0,0 +1,203 @@
+"""
+Локальный заменитель сайта поиска треков.
+
+Повторяет то, на что опирается парсер:
+    GET/POST /login           форма входа (#user, #pass, #login-submit), cookie сессии
+    GET  /search              страница поиска (#loader_overlay, #search-q-track-elastic,
+                              #search-track-btn-elastic), переход на /search/results по кнопке
+    GET  /search/results?q=   список найденных треков или "No results found"
+
+Без cookie сессии страницы поиска перенаправляют на /login.
+
+Запуск отдельно из папки FindTheTunesRESERCH:
+    python -m benchmark.fake_site --port 8090
+"""
+import html
+import time
+import random
+import secrets
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Iterable, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+SESSION_COOKIE = 'ftt_session'
+
+LOGIN_PAGE = """<!doctype html>
+<html><body>
+<form method="post" action="/login">
+  <input id="user" name="user"> <input id="pass" name="pass" type="password">
+  <button id="login-submit" type="submit">Войти</button>
+</form>
+</body></html>"""
+
+SEARCH_PAGE = """<!doctype html>
+<html><body>
+<div id="loader_overlay" style="display:none"></div>
+<input id="search-q-track-elastic" type="text">
+<button id="search-track-btn-elastic" type="button"
+  onclick="location.href='/search/results?q='+encodeURIComponent(document.getElementById('search-q-track-elastic').value)">
+  Search</button>
+</body></html>"""
+
+RESULTS_PAGE = """<!doctype html>
+<html><head><title>Search</title><script>var analytics = "not found";</script></head><body>
+<h1>Search results</h1>
+{body}
+</body></html>"""
+
+
+def _normalize(text: str) -> str:
+    return ' '.join(text.lower().split())
+
+
+def make_catalog(tracks: int, found_ratio: float = 0.7, seed: int = 0) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
+    """
+    Возвращает (catalog, queries): треки сайта и список для поиска из
+    tracks строк, в котором доля found_ratio есть в каталоге.
+    """
+    rng = random.Random(seed)
+    catalog, queries = [], []
+    for i in range(tracks):
+        artist, title = f"Artist {i:05d}", f"Track Title {i:05d}"
+        queries.append((artist, title))
+        if rng.random() < found_ratio:
+            catalog.append((artist, title))
+    return catalog, queries
+
+
+class FakeSite:
+    """HTTP-сервер сайта поиска с настраиваемой задержкой ответа."""
+
+    def __init__(self, catalog: Iterable[Tuple[str, str]], username: str = 'user', password: str = 'pass',
+                 host: str = '127.0.0.1', port: int = 0, latency: float = 0.0):
+        """
+        Args:
+            catalog: Пары (артист, название), которые сайт находит.
+            username, password: Учетные данные формы входа.
+            latency: Задержка каждого ответа в секундах.
+        """
+        self.catalog = {_normalize(f"{artist} {title}"): (artist, title) for artist, title in catalog}
+        self.username = username
+        self.password = password
+        self.latency = latency
+        self.sessions = set()
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeSite":
+        """Запускает сервер в фоновом потоке."""
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Обслуживает запросы в текущем потоке до Ctrl+C."""
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def search(self, query: str) -> Optional[Tuple[str, str]]:
+        return self.catalog.get(_normalize(query))
+
+    def _handler_class(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: str = '', headers: Optional[dict] = None) -> None:
+                data = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _begin(self) -> None:
+                with site._lock:
+                    site.requests += 1
+                if site.latency:
+                    time.sleep(site.latency)
+
+            def _logged_in(self) -> bool:
+                for part in self.headers.get('Cookie', '').split(';'):
+                    name, _, value = part.strip().partition('=')
+                    if name == SESSION_COOKIE and value in site.sessions:
+                        return True
+                return False
+
+            def do_GET(self):
+                self._begin()
+                url = urlparse(self.path)
+                if url.path == '/login':
+                    return self._send(200, LOGIN_PAGE)
+                if url.path in ('/', '/search', '/search/results') and not self._logged_in():
+                    return self._send(302, headers={'Location': '/login'})
+                if url.path in ('/', '/search'):
+                    return self._send(200, SEARCH_PAGE)
+                if url.path == '/search/results':
+                    query = parse_qs(url.query).get('q', [''])[0]
+                    match = site.search(query)
+                    if match is None:
+                        body = f"<p>No results found for &quot;{html.escape(query)}&quot;</p>"
+                    else:
+                        body = f"<ul><li>{html.escape(match[0])} — {html.escape(match[1])}</li></ul>"
+                    return self._send(200, RESULTS_PAGE.format(body=body))
+                self._send(404, "<p>Page not found</p>")
+
+            def do_POST(self):
+                self._begin()
+                if urlparse(self.path).path != '/login':
+                    return self._send(404, "<p>Page not found</p>")
+                length = int(self.headers.get('Content-Length', 0))
+                form = parse_qs(self.rfile.read(length).decode('utf-8'))
+                if form.get('user', [''])[0] != site.username or form.get('pass', [''])[0] != site.password:
+                    return self._send(200, LOGIN_PAGE)
+                token = secrets.token_hex(16)
+                with site._lock:
+                    site.sessions.add(token)
+                self._send(302, headers={'Location': '/search',
+                                         'Set-Cookie': f"{SESSION_COOKIE}={token}; Path=/"})
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Локальный заменитель сайта поиска треков")
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--tracks', type=int, default=1000, help="Размер каталога")
+    parser.add_argument('--latency', type=float, default=0.05, help="Задержка ответа в секундах")
+    args = parser.parse_args()
+
+    catalog, _ = make_catalog(args.tracks, found_ratio=1.0)
+    site = FakeSite(catalog, port=args.port, latency=args.latency)
+    print(f"LOGIN_URL = \"{site.base_url}/login\"")
+    print(f"SEARCH_URL = \"{site.base_url}/search\"")
+    print(f"SEARCH_API_URL = \"{site.base_url}/search/results\"")
+    print("USERNAME, PASSWORD = \"user\", \"pass\"")
+    site.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
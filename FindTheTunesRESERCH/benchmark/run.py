@@ -0,0 +1,175 @@
+"""
+Замер скорости поиска разными backend'ами на локальном заменителе сайта.
+
+Для каждого backend'а список треков ищется через search_tracks так же, как
+в full_parser_with_csv.py, и сверяется с каталогом сайта. Backend selenium
+требует установленного Chrome; если браузер не запускается, замер
+пропускается.
+
+Запуск из папки FindTheTunesRESERCH:
+    python -m benchmark.run --tracks 200 --backends http selenium --workers 4
+"""
+import io
+import os
+import sys
+import csv
+import json
+import time
+import types
+import logging
+import argparse
+import platform
+import tempfile
+import contextlib
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from benchmark.fake_site import FakeSite, make_catalog, SESSION_COOKIE
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+
+def configure(site: FakeSite, input_csv: str, args: argparse.Namespace):
+    """Направляет conf на заменитель сайта (при отсутствии conf.py - новый модуль)."""
+    try:
+        import conf
+    except ImportError:
+        conf = types.ModuleType('conf')
+        sys.modules['conf'] = conf
+    conf.LOGIN_URL = f"{site.base_url}/login"
+    conf.SEARCH_URL = f"{site.base_url}/search"
+    conf.SEARCH_API_URL = f"{site.base_url}/search/results"
+    conf.SEARCH_QUERY_PARAM = 'q'
+    conf.USERNAME, conf.PASSWORD = site.username, site.password
+    conf.INPUT_CSV = input_csv
+    conf.HEADLESS_MODE = True
+    conf.WINDOW_SIZE = getattr(conf, 'WINDOW_SIZE', (1280, 900))
+    conf.TIMEOUT = getattr(conf, 'TIMEOUT', 20)
+    conf.DELAY_BETWEEN_REQUESTS = args.min_interval
+    conf.MIN_REQUEST_INTERVAL = args.min_interval
+    return conf
+
+
+def write_input(path: str, queries: List[tuple]) -> None:
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, delimiter=';')
+        writer.writerow(['Artist', 'Title'])
+        writer.writerows(queries)
+
+
+def http_login(site: FakeSite) -> List[Dict[str, str]]:
+    """Входит на сайт без браузера и возвращает cookies в формате Selenium."""
+    session = requests.Session()
+    session.post(f"{site.base_url}/login", data={'user': site.username, 'pass': site.password})
+    return [{'name': SESSION_COOKIE, 'value': session.cookies.get(SESSION_COOKIE), 'path': '/'}]
+
+
+def bench_backend(parser, name: str, site: FakeSite, input_csv: str, expected: set,
+                  workers: int) -> Optional[Dict[str, Any]]:
+    """Ищет все треки выбранным backend'ом; None, если backend недоступен."""
+    from search_backends import HttpSearchBackend, RequestThrottle
+    import conf
+
+    tracks = parser.load_tracks(input_csv)
+    driver = None
+    if name == 'http':
+        throttle = RequestThrottle(conf.MIN_REQUEST_INTERVAL) if conf.MIN_REQUEST_INTERVAL else None
+        backend = HttpSearchBackend(conf.SEARCH_API_URL, http_login(site), login_url=conf.LOGIN_URL,
+                                    throttle=throttle, pool_size=workers)
+        make_backend = None
+    else:
+        try:
+            driver, wait = parser.initialize_driver(headless=True)
+        except Exception as e:
+            print(f"{name}: браузер не запускается, замер пропущен ({e.__class__.__name__})")
+            return None
+        if not parser.login(driver, wait):
+            driver.quit()
+            return None
+        backend, make_backend = parser.make_search_backends(driver, wait, name, workers, conf.MIN_REQUEST_INTERVAL)
+
+    site.requests = 0
+    started = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = parser.search_tracks(backend, tracks, workers, make_backend)
+    finally:
+        backend.close()
+        if driver is not None:
+            driver.quit()
+    seconds = time.perf_counter() - started
+
+    correct = sum(1 for t in results if t['found'] == ((t['artist'], t['title']) in expected))
+    statuses: Dict[str, int] = {}
+    for t in results:
+        statuses[t['status']] = statuses.get(t['status'], 0) + 1
+    return {
+        'backend': name,
+        'workers': workers,
+        'tracks': len(results),
+        'seconds': seconds,
+        'tracks_per_second': len(results) / seconds if seconds else None,
+        'correct': correct,
+        'statuses': statuses,
+        'site_requests': site.requests,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк backend'ов поиска FindTheTunesRESERCH")
+    parser.add_argument('--tracks', type=int, default=200, help="Количество треков в списке")
+    parser.add_argument('--found-ratio', type=float, default=0.7, help="Доля треков, которые есть на сайте")
+    parser.add_argument('--backends', nargs='+', default=['http', 'selenium'], choices=['http', 'selenium'])
+    parser.add_argument('--workers', type=int, default=1, help="Количество потоков поиска")
+    parser.add_argument('--latency', type=float, default=0.05, help="Задержка ответа сайта в секундах")
+    parser.add_argument('--min-interval', type=float, default=0.0,
+                        help="Общий интервал между запросами (0 - без ограничения)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None, help="Путь к JSON с результатами")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    catalog, queries = make_catalog(args.tracks, args.found_ratio, args.seed)
+    site = FakeSite(catalog, latency=args.latency).start()
+
+    results = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            input_csv = os.path.join(tmp, 'serch_list.csv')
+            write_input(input_csv, queries)
+            configure(site, input_csv, args)
+            # Замер вызывает только search_tracks: парсер не пишет ни лог, ни промежуточные файлы
+            import full_parser_with_csv
+
+            for name in args.backends:
+                entry = bench_backend(full_parser_with_csv, name, site, input_csv, set(catalog), args.workers)
+                if entry is None:
+                    continue
+                results.append(entry)
+                print(f"{name:<9} {entry['workers']} потоков: {entry['seconds']:.2f} с "
+                      f"({entry['tracks_per_second']:.1f} треков/с), верно {entry['correct']}/{entry['tracks']}, "
+                      f"запросов к сайту {entry['site_requests']}")
+    finally:
+        site.stop()
+
+    report = {
+        'date': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'host': platform.node(),
+        'settings': vars(args),
+        'results': results,
+    }
+    output_path = args.output
+    if output_path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output_path = os.path.join(RESULTS_DIR, f"bench_{datetime.now():%Y%m%d_%H%M%S}.json")
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Результаты сохранены в {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Промежуточное сохранение результатов поиска дописыванием в конец файлов.
+
+Каждый результат добавляется строкой в JSON Lines и строкой в CSV, поэтому
+стоимость сохранения не растет с длиной списка. Записи копятся в памяти и
+сбрасываются на диск каждые flush_every результатов или flush_seconds
+секунд - что наступит раньше.
+"""
+import csv
+import json
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointWriter:
+    """Дописывает результаты текущего запуска в JSONL и CSV."""
+
+    def __init__(self, jsonl_path, csv_path, fieldnames, flush_every=20, flush_seconds=30.0):
+        """
+        Args:
+            jsonl_path: Файл JSON Lines, по треку на строку.
+            csv_path: CSV со строками входного файла и колонкой FindStatus.
+            fieldnames: Столбцы CSV.
+            flush_every: Сбрасывать на диск после стольких результатов.
+            flush_seconds: Сбрасывать на диск не реже, чем раз в столько секунд.
+        """
+        self.jsonl_path = jsonl_path
+        self.csv_path = csv_path
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+        self.written = 0
+        self._tracks = []
+        self._rows = []
+        self._last_flush = time.monotonic()
+
+        # Файлы относятся к текущему запуску; итог всех запусков хранится в ResultStore
+        self._jsonl = open(jsonl_path, 'w', encoding='utf-8')
+        self._csv_file = open(csv_path, 'w', encoding='utf-8', newline='')
+        self._csv = csv.DictWriter(self._csv_file, fieldnames=fieldnames, delimiter=';')
+        self._csv.writeheader()
+        self._csv_file.flush()
+
+    def add(self, track, row):
+        """Добавляет результат трека и строку CSV; при необходимости сбрасывает на диск."""
+        self._tracks.append(track)
+        self._rows.append(row)
+        if (len(self._tracks) >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_seconds):
+            self.flush()
+
+    def flush(self):
+        """Записывает накопленные результаты в конец файлов."""
+        self._last_flush = time.monotonic()
+        if not self._tracks:
+            return
+        self._jsonl.writelines(json.dumps(track, ensure_ascii=False) + '\n' for track in self._tracks)
+        self._csv.writerows(self._rows)
+        self._jsonl.flush()
+        self._csv_file.flush()
+        self.written += len(self._tracks)
+        logger.info(f"Промежуточные результаты дописаны: {self.written} треков")
+        self._tracks, self._rows = [], []
+
+    def close(self):
+        self.flush()
+        self._jsonl.close()
+        self._csv_file.close()
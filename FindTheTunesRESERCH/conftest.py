@@ -0,0 +1,23 @@
+"""
+Общие настройки тестов FindTheTunesRESERCH.
+
+Запуск из папки FindTheTunesRESERCH:
+    python -m pytest
+"""
+import sys
+import types
+
+# Если conf.py не заполнен, тесты используют собственные настройки
+try:
+    import conf
+except ImportError:
+    conf = types.ModuleType('conf')
+    conf.LOGIN_URL = 'http://127.0.0.1/login'
+    conf.SEARCH_URL = 'http://127.0.0.1/search'
+    conf.USERNAME, conf.PASSWORD = 'user', 'password'
+    conf.INPUT_CSV = 'serch_list.csv'
+    conf.HEADLESS_MODE = True
+    conf.WINDOW_SIZE = (1280, 900)
+    conf.TIMEOUT = 20
+    conf.DELAY_BETWEEN_REQUESTS = 0
+    sys.modules['conf'] = conf
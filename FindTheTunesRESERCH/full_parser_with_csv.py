@@ -7,8 +7,12 @@ import sys
 import json
 import csv
 import time
+import queue
 import logging
+import argparse
+import threading
 from datetime import datetime
+from urllib.parse import urlsplit
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -17,33 +21,51 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 
 from webdriver_manager.chrome import ChromeDriverManager
 
 import conf
+from search_backends import SearchBackend, HttpSearchBackend, RequestThrottle, classify_page
+from result_store import ResultStore, restore_results, track_key, apply_result, group_tracks
+from checkpoint import CheckpointWriter
 
 # Определяем базовую директорию, где лежит скрипт
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
-# Настройка логирования
 LOG_FILE_PATH = os.path.join(BASE_DIR, 'full_parser_with_csv.log')
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE_PATH),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
 
-def initialize_driver():
-    """Настраивает и инициализирует WebDriver."""
+def setup_logging(log_path=LOG_FILE_PATH):
+    """Настраивает логирование в файл и консоль (при запуске скрипта, а не при импорте)."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(log_path),
+            logging.StreamHandler()
+        ]
+    )
+
+
+# Отметки в консоли для статусов поиска
+STATUS_MARKS = {
+    'found': "✅ FindTheTune",
+    'not_found': "❌ NIL",
+    'unknown': "❓",
+    'error': "⚠️ ОШИБКА",
+}
+# Промежуточные результаты сбрасываются на диск каждые N треков или T секунд
+CHECKPOINT_EVERY = 20
+CHECKPOINT_SECONDS = 30.0
+
+
+def initialize_driver(headless=None):
+    """Настраивает и инициализирует WebDriver (headless=None - из conf.HEADLESS_MODE)."""
     logger.info("Инициализация WebDriver...")
     options = Options()
-    if conf.HEADLESS_MODE:
+    if conf.HEADLESS_MODE if headless is None else headless:
         options.add_argument('--headless')
     options.add_argument(f'--window-size={conf.WINDOW_SIZE[0]},{conf.WINDOW_SIZE[1]}')
     options.add_argument('--disable-blink-features=AutomationControlled')
@@ -88,10 +110,20 @@ def login(driver, wait):
         return False
 
 
-def load_tracks(input_csv_path):
-    """Загружает треки из CSV файла."""
-    logger.info(f"Загрузка треков из {input_csv_path}")
-    tracks = []
+def copy_session(cookies, driver):
+    """Переносит cookies авторизованной сессии в другой WebDriver вместо повторного входа."""
+    parts = urlsplit(conf.SEARCH_URL)
+    # Cookies можно добавить только находясь на странице того же домена
+    driver.get(f"{parts.scheme}://{parts.netloc}/")
+    for cookie in cookies:
+        try:
+            driver.add_cookie(cookie)
+        except WebDriverException as e:
+            logger.warning(f"Не удалось перенести cookie {cookie.get('name')}: {e}")
+
+
+def read_input_csv(input_csv_path):
+    """Читает входной CSV целиком: возвращает (имена столбцов, строки)."""
     with open(input_csv_path, 'r', encoding='utf-8') as file:
         # Определение диалекта CSV
         try:
@@ -102,19 +134,34 @@ def load_tracks(input_csv_path):
             dialect = 'excel' # fallback
 
         reader = csv.DictReader(file, dialect=dialect)
-        for row in reader:
-            tracks.append({
-                'title': row.get('Title', '').strip(),
-                'artist': row.get('Artist', '').strip(),
-                'status': 'pending',
-                'found': False
-            })
+        rows = list(reader)
+        return list(reader.fieldnames or []), rows
+
+
+def load_tracks(input_csv_path, rows=None):
+    """Загружает треки из CSV файла (или из уже прочитанных строк rows)."""
+    logger.info(f"Загрузка треков из {input_csv_path}")
+    if rows is None:
+        _, rows = read_input_csv(input_csv_path)
+    tracks = []
+    for row in rows:
+        tracks.append({
+            'title': (row.get('Title') or '').strip(),
+            'artist': (row.get('Artist') or '').strip(),
+            'status': 'pending',
+            'found': False
+        })
     logger.info(f"Загружено {len(tracks)} треков для поиска.")
     return tracks
 
 
-def search_and_analyze_track(driver, wait, track):
-    """Ищет один трек и анализирует результат."""
+def search_and_analyze_track(driver, wait, track, throttle=None):
+    """
+    Ищет один трек и анализирует результат.
+
+    Если передан общий throttle, он заменяет паузу conf.DELAY_BETWEEN_REQUESTS
+    после каждого поиска.
+    """
     if not track['title'] or not track['artist']:
         track['status'] = 'error'
         track['error'] = 'Missing title or artist'
@@ -122,6 +169,8 @@ def search_and_analyze_track(driver, wait, track):
 
     try:
         # Принудительный переход на страницу поиска для каждого трека
+        if throttle is not None:
+            throttle.wait()
         driver.get(conf.SEARCH_URL)
         # Ждем, пока оверлей загрузки не исчезнет
         wait.until(EC.invisibility_of_element_located((By.ID, "loader_overlay")))
@@ -167,38 +216,56 @@ def search_and_analyze_track(driver, wait, track):
                 EC.presence_of_element_located((By.XPATH, "//*[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'not found')]"))
             )
         )
-        time.sleep(conf.DELAY_BETWEEN_REQUESTS) # Задержка между запросами
+        if throttle is None:
+            time.sleep(conf.DELAY_BETWEEN_REQUESTS) # Задержка между запросами
 
         # 4. Анализ результатов
         page_text = driver.find_element(By.TAG_NAME, "body").text.lower()
         track['page_url'] = driver.current_url
         track['search_query'] = search_query
 
-        not_found_indicators = ['no results', 'not found', '0 results', 'nothing found']
-        
-        if any(indicator in page_text for indicator in not_found_indicators):
-            track['found'] = False
-            track['status'] = 'not_found'
-            print("❌ NIL")
-        else:
-            # Упрощенная проверка на наличие названия трека или артиста
-            if track['title'].lower() in page_text or track['artist'].lower() in page_text:
-                track['found'] = True
-                track['status'] = 'found'
-                print("✅ FindTheTune")
-            else:
-                track['status'] = 'unknown'
-                print("❓")
+        classify_page(track, page_text)
 
     except Exception as e:
         logger.error(f"Ошибка при поиске трека {track['artist']} - {track['title']}: {e}")
         track['status'] = 'error'
         track['error'] = str(e)
-        print("⚠️ ОШИБКА")
     
     return track
 
 
+class SeleniumSearchBackend(SearchBackend):
+    """Поиск через браузер (search_and_analyze_track); вызовы одного драйвера идут по очереди."""
+
+    name = 'selenium'
+
+    def __init__(self, driver, wait, throttle=None, owns_driver=False):
+        self.driver = driver
+        self.wait = wait
+        self.throttle = throttle
+        self.owns_driver = owns_driver
+        self._lock = threading.Lock()
+
+    def search(self, track):
+        with self._lock:
+            return search_and_analyze_track(self.driver, self.wait, track, self.throttle)
+
+    def close(self):
+        if self.owns_driver:
+            self.driver.quit()
+
+
+def start_selenium_backend(cookies, throttle):
+    """Запускает дополнительный headless WebDriver с cookies авторизованной сессии."""
+    driver, wait = initialize_driver(headless=True)
+    try:
+        copy_session(cookies, driver)
+    except Exception:
+        driver.quit()
+        raise
+    return SeleniumSearchBackend(driver, wait, throttle, owns_driver=True)
+
+
 def save_results(results, filename):
     """Сохранение результатов в JSON."""
     output = {
@@ -215,40 +282,45 @@ def save_results(results, filename):
     logger.info(f"Результаты сохранены в {filename}")
 
 
-def update_csv_with_results(results, input_csv=conf.INPUT_CSV, output_csv=None):
-    """Обновляет CSV файл с текущими результатами."""
-    if output_csv is None:
-        base, ext = os.path.splitext(input_csv)
-        output_csv = f"{base}_results{ext}"
+def results_csv_path(input_csv, suffix='_results'):
+    """Путь к CSV с результатами рядом с входным файлом."""
+    base, ext = os.path.splitext(input_csv)
+    return f"{base}{suffix}{ext}"
 
-    results_dict = {f"{t.get('artist', '')}_{t.get('title', '')}": t for t in results}
-    
-    rows_with_results = []
-    fieldnames = []
 
-    with open(input_csv, 'r', encoding='utf-8') as f:
-        try:
-            sample = f.read(2048)
-            f.seek(0)
-            dialect = csv.Sniffer().sniff(sample, delimiters=';,')
-        except csv.Error:
-            dialect = 'excel'  # fallback
-
-        reader = csv.DictReader(f, dialect=dialect)
-        fieldnames = reader.fieldnames + ['FindStatus']
-        for row in reader:
-            key = f"{row.get('Artist', '').strip()}_{row.get('Title', '').strip()}"
-            result_track = results_dict.get(key)
-            if result_track:
-                if result_track.get('found'):
-                    row['FindStatus'] = 'FindTheTune'
-                elif result_track.get('status') == 'not_found':
-                    row['FindStatus'] = 'NIL'
-                elif result_track.get('status') == 'error':
-                    row['FindStatus'] = 'ERROR'
-            else:
-                row['FindStatus'] = ''
-            rows_with_results.append(row)
+def result_row(row, track):
+    """Копия строки входного CSV с колонкой FindStatus по результату трека."""
+    row = dict(row)
+    if track is None:
+        row['FindStatus'] = ''
+    elif track.get('found'):
+        row['FindStatus'] = 'FindTheTune'
+    elif track.get('status') == 'not_found':
+        row['FindStatus'] = 'NIL'
+    elif track.get('status') == 'error':
+        row['FindStatus'] = 'ERROR'
+    return row
+
+
+def update_csv_with_results(results, input_csv=conf.INPUT_CSV, output_csv=None, input_rows=None):
+    """
+    Обновляет CSV файл с текущими результатами.
+
+    input_rows - уже прочитанные (имена столбцов, строки) входного файла,
+    чтобы не читать его повторно.
+    """
+    if output_csv is None:
+        output_csv = results_csv_path(input_csv)
+    if input_rows is None:
+        input_rows = read_input_csv(input_csv)
+    input_fieldnames, rows = input_rows
+
+    results_dict = {track_key(t.get('artist', ''), t.get('title', '')): t for t in results}
+    fieldnames = input_fieldnames + ['FindStatus']
+    rows_with_results = [
+        result_row(row, results_dict.get(track_key(row.get('Artist') or '', row.get('Title') or '')))
+        for row in rows
+    ]
 
     with open(output_csv, 'w', encoding='utf-8', newline='') as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames, delimiter=';')
@@ -258,44 +330,213 @@ def update_csv_with_results(results, input_csv=conf.INPUT_CSV, output_csv=None):
     return output_csv
 
 
-def run_parser():
+def search_worker(backend, jobs, done):
+    """
+    Берет треки из общей очереди, пока она не опустеет.
+
+    Ошибка поиска одного трека записывается в его статус и не останавливает поток.
+    """
+    while True:
+        try:
+            index, track = jobs.get_nowait()
+        except queue.Empty:
+            return
+        try:
+            track = backend.search(track)
+        except Exception as e:
+            logger.error(f"Ошибка при поиске трека {track['artist']} - {track['title']}: {e}")
+            track['status'] = 'error'
+            track['error'] = str(e)
+        done.put((index, track))
+
+
+def extra_search_worker(make_backend, jobs, done):
+    """Создает собственный backend (например, еще один браузер) и обрабатывает очередь."""
+    try:
+        backend = make_backend()
+    except Exception as e:
+        logger.error(f"Не удалось запустить дополнительный поиск: {e}")
+        return
+    try:
+        search_worker(backend, jobs, done)
+    except Exception as e:
+        logger.error(f"Дополнительный поиск остановлен из-за ошибки: {e}")
+    finally:
+        backend.close()
+
+
+def search_tracks(backend, tracks, workers=1, make_backend=None, on_result=None):
+    """
+    Ищет треки в workers потоках из общей очереди.
+
+    Первый поток использует backend. Остальные создают свой через
+    make_backend (каждому браузеру нужен свой драйвер) или, если он не
+    задан, используют тот же backend (HTTP-поиск с общим пулом соединений).
+    on_result(track) вызывается в текущем потоке сразу после каждого
+    результата (запись в хранилище и промежуточные файлы).
+    Результаты возвращаются в порядке входного списка.
+    """
+    jobs = queue.Queue()
+    for item in enumerate(tracks):
+        jobs.put(item)
+    done = queue.Queue()
+
+    threads = [threading.Thread(target=search_worker, args=(backend, jobs, done), daemon=True)]
+    for _ in range(workers - 1):
+        if make_backend is None:
+            threads.append(threading.Thread(target=search_worker, args=(backend, jobs, done), daemon=True))
+        else:
+            threads.append(threading.Thread(target=extra_search_worker, args=(make_backend, jobs, done), daemon=True))
+    for thread in threads:
+        thread.start()
+
+    results = [None] * len(tracks)
+    completed = 0
+    while completed < len(tracks):
+        try:
+            index, track = done.get(timeout=1.0)
+        except queue.Empty:
+            if not any(thread.is_alive() for thread in threads) and done.empty():
+                break
+            continue
+        results[index] = track
+        completed += 1
+        if on_result is not None:
+            on_result(track)
+        mark = STATUS_MARKS.get(track['status'], track['status'])
+        print(f"[{completed}/{len(tracks)}] Поиск: {track['artist']} - {track['title']} {mark}")
+
+    for thread in threads:
+        thread.join()
+    return [t for t in results if t is not None]
+
+
+def make_search_backends(driver, wait, backend_name='selenium', workers=1, min_interval=None):
+    """
+    Создает основной backend поиска и фабрику дополнительных для search_tracks.
+
+    Selenium без параллельности сохраняет прежнюю паузу после каждого поиска;
+    в остальных случаях частоту запросов ограничивает общий RequestThrottle.
+    """
+    throttle = None
+    if workers > 1 or backend_name == 'http':
+        if min_interval is None:
+            min_interval = getattr(conf, 'MIN_REQUEST_INTERVAL', conf.DELAY_BETWEEN_REQUESTS)
+        throttle = RequestThrottle(min_interval)
+
+    selenium_backend = SeleniumSearchBackend(driver, wait, throttle)
+    search_api_url = getattr(conf, 'SEARCH_API_URL', None)
+    if backend_name == 'http' and not search_api_url:
+        logger.warning("В conf.py не задан SEARCH_API_URL, поиск будет выполняться через браузер.")
+        backend_name = 'selenium'
+
+    if backend_name == 'http':
+        backend = HttpSearchBackend(
+            search_api_url,
+            driver.get_cookies(),
+            query_param=getattr(conf, 'SEARCH_QUERY_PARAM', 'q'),
+            login_url=conf.LOGIN_URL,
+            user_agent=driver.execute_script("return navigator.userAgent"),
+            throttle=throttle,
+            fallback=selenium_backend,
+            pool_size=workers,
+            timeout=conf.TIMEOUT
+        )
+        return backend, None
+
+    cookies = driver.get_cookies() if workers > 1 else []
+    return selenium_backend, lambda: start_selenium_backend(cookies, throttle)
+
+
+def parse_args():
+    """Разбирает аргументы командной строки."""
+    parser = argparse.ArgumentParser(description="Поиск треков на сайте с обновлением CSV")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Количество браузеров, ищущих параллельно (по умолчанию 1)")
+    parser.add_argument('--backend', choices=['selenium', 'http'],
+                        default=getattr(conf, 'SEARCH_BACKEND', 'selenium'),
+                        help="Способ поиска: браузер (selenium) или прямые HTTP-запросы с cookies "
+                             "сессии браузера (http, нужен SEARCH_API_URL в conf.py)")
+    parser.add_argument('--retry-failed', action='store_true',
+                        help="Повторить поиск треков с ошибкой или неопределенным результатом "
+                             "из прошлых запусков")
+    parser.add_argument('--db', default=getattr(conf, 'RESULTS_DB', os.path.join(BASE_DIR, 'search_results.sqlite3')),
+                        help="Файл SQLite с результатами прошлых запусков")
+    parser.add_argument('--cache-ttl', type=float, default=getattr(conf, 'RESULTS_TTL_DAYS', None),
+                        help="Сколько дней считать результаты прошлых запусков актуальными "
+                             "(по умолчанию бессрочно)")
+    parser.add_argument('--min-interval', type=float, default=None,
+                        help="Минимальный интервал между запросами всех браузеров в секундах "
+                             "(по умолчанию conf.MIN_REQUEST_INTERVAL или conf.DELAY_BETWEEN_REQUESTS)")
+    return parser.parse_args()
+
+
+def run_parser(workers=1, min_interval=None, backend_name='selenium', db_path=None, retry_failed=False,
+               cache_ttl=None):
     """Основная функция, запускающая парсер."""
     print("=" * 60)
     print("ПОЛНЫЙ ПАРСЕР С ОБНОВЛЕНИЕМ CSV")
     print("=" * 60)
 
-    driver, wait = initialize_driver()
-    
-    try:
-        if not login(driver, wait):
-            return # Завершаем работу, если логин не удался
+    driver = None
+    store = ResultStore(db_path or os.path.join(BASE_DIR, 'search_results.sqlite3'))
 
-        tracks = load_tracks(conf.INPUT_CSV)
+    try:
+        # Входной файл читается один раз; итоговый CSV собирается из этих строк
+        input_fieldnames, input_rows = read_input_csv(conf.INPUT_CSV)
+        tracks = load_tracks(conf.INPUT_CSV, input_rows)
         if not tracks:
             print("Не найдено треков для обработки.")
             return
-            
-        print(f"Начинаю поиск {len(tracks)} треков...")
-        print("📝 CSV файл будет обновляться каждые 20 треков")
-        
-        results = []
 
-        for i, track in enumerate(tracks, 1):
-            print(f"\n[{i}/{len(tracks)}] Поиск: {track['artist']} - {track['title']}", end=' ')
-            
-            processed_track = search_and_analyze_track(driver, wait, track)
-            results.append(processed_track)
-            
-            # Периодическое сохранение результатов
-            if i % 20 == 0:
-                save_results(results, 'intermediate_results.json')
-                update_csv_with_results(results)
-                print(f"\n💾 Промежуточные результаты сохранены и CSV обновлен.")
+        # Треки с результатом из прошлых запусков повторно не ищем
+        restored, pending = restore_results(tracks, store.load(cache_ttl), retry_failed)
+        if restored:
+            print(f"♻️ Результаты {len(restored)} треков взяты из {store.path}")
+
+        # Повторы одного трека (регистр, пробелы, знаки препинания) ищутся один раз
+        groups = group_tracks(pending)
+        if len(groups) < len(pending):
+            print(f"🔁 {len(pending) - len(groups)} повторов в списке: ищется {len(groups)} уникальных треков")
+
+        if pending:
+            driver, wait = initialize_driver()
+            if not login(driver, wait):
+                return # Завершаем работу, если логин не удался
+
+            print(f"Начинаю поиск {len(groups)} треков" + (f" в {workers} браузерах..." if workers > 1 else "..."))
+            backend, make_backend = make_search_backends(driver, wait, backend_name, workers, min_interval)
+            checkpoint = CheckpointWriter(
+                os.path.join(BASE_DIR, 'intermediate_results.jsonl'),
+                results_csv_path(conf.INPUT_CSV, '_results_partial'),
+                input_fieldnames + ['FindStatus'],
+                flush_every=getattr(conf, 'CHECKPOINT_EVERY', CHECKPOINT_EVERY),
+                flush_seconds=getattr(conf, 'CHECKPOINT_SECONDS', CHECKPOINT_SECONDS)
+            )
+            print(f"📝 Промежуточные результаты дописываются в {checkpoint.jsonl_path} и {checkpoint.csv_path} "
+                  f"каждые {checkpoint.flush_every} треков или {checkpoint.flush_seconds:g} с")
+            row_by_track = {id(track): row for track, row in zip(tracks, input_rows)}
+
+            def on_result(track):
+                store.save(track)
+                for same_track in groups[track_key(track['artist'], track['title'])]:
+                    if same_track is not track:
+                        apply_result(same_track, track)
+                    checkpoint.add(same_track, result_row(row_by_track[id(same_track)], same_track))
+
+            try:
+                search_tracks(backend, [group[0] for group in groups.values()], workers, make_backend, on_result)
+            finally:
+                backend.close()
+                checkpoint.close()
+
+        # Треки изменены на месте; не найденные из-за остановки потоков остаются pending
+        results = [t for t in tracks if t['status'] != 'pending']
 
         # Финальное сохранение
         final_json_path = os.path.join(BASE_DIR, 'full_search_results.json')
         save_results(results, final_json_path)
-        final_csv_path = update_csv_with_results(results)
+        final_csv_path = update_csv_with_results(results, conf.INPUT_CSV, input_rows=(input_fieldnames, input_rows))
 
         # Статистика
         print("\n" + "=" * 60)
@@ -318,11 +559,15 @@ def run_parser():
         logger.critical(f"Произошла критическая ошибка: {e}", exc_info=True)
     
     finally:
-        print("\nПарсер завершен. Браузер закроется через 5 секунд...")
-        time.sleep(5)
-        if 'driver' in locals() and driver:
+        store.close()
+        if driver is not None:
+            print("\nПарсер завершен. Браузер закроется через 5 секунд...")
+            time.sleep(5)
             driver.quit()
 
 
 if __name__ == "__main__":
-    run_parser()
\ No newline at end of file
+    args = parse_args()
+    setup_logging()
+    run_parser(workers=max(1, args.workers), min_interval=args.min_interval, backend_name=args.backend,
+               db_path=args.db, retry_failed=args.retry_failed, cache_ttl=args.cache_ttl)
\ No newline at end of file
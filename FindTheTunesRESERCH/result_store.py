@@ -0,0 +1,134 @@
+"""
+Постоянное хранилище результатов поиска (SQLite).
+
+Каждый результат записывается сразу после поиска, поэтому после сбоя
+повторный запуск продолжает с того места, где остановился. Ключ -
+нормализованные артист и название трека: строки, отличающиеся только
+регистром, пробелами или знаками препинания, считаются одним треком и
+ищутся один раз.
+"""
+import sqlite3
+import logging
+import threading
+import unicodedata
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+# Статусы, которые не нужно перепроверять при повторном запуске
+FINAL_STATUSES = frozenset(['found', 'not_found'])
+# Статусы, которые перепроверяются с --retry-failed
+RETRY_STATUSES = frozenset(['error', 'unknown'])
+# Поля трека, сохраняемые в хранилище
+STORED_FIELDS = ('artist', 'title', 'status', 'found', 'page_url', 'search_query', 'error')
+
+
+def normalize_text(text):
+    """Приводит строку к виду для сравнения: NFKC, без регистра, знаков препинания и лишних пробелов."""
+    text = unicodedata.normalize('NFKC', text).casefold()
+    text = ''.join(' ' if unicodedata.category(char).startswith('P') else char for char in text)
+    return ' '.join(text.split())
+
+
+def track_key(artist, title):
+    """Ключ трека: нормализованные артист и название."""
+    return f"{normalize_text(artist)}\x1f{normalize_text(title)}"
+
+
+def apply_result(track, result):
+    """Переносит результат поиска в трек. Артист и название остаются из входного файла."""
+    track.update({k: v for k, v in result.items() if k in STORED_FIELDS and k not in ('artist', 'title')})
+    return track
+
+
+def group_tracks(tracks):
+    """Группирует треки по track_key: ключ → треки в порядке входного списка."""
+    groups = {}
+    for track in tracks:
+        groups.setdefault(track_key(track['artist'], track['title']), []).append(track)
+    return groups
+
+
+class ResultStore:
+    """Результаты поиска по ключу track_key."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                artist TEXT,
+                title TEXT,
+                status TEXT NOT NULL,
+                found INTEGER NOT NULL DEFAULT 0,
+                page_url TEXT,
+                search_query TEXT,
+                error TEXT,
+                updated_at TEXT NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def load(self, ttl_days=None):
+        """
+        Возвращает сохраненные результаты: ключ → поля трека.
+
+        Если задан ttl_days, результаты старше стольких дней не возвращаются
+        и трек ищется заново.
+        """
+        query = f"SELECT key, {', '.join(STORED_FIELDS)} FROM results"
+        params = []
+        if ttl_days is not None:
+            query += " WHERE updated_at >= ?"
+            params.append((datetime.now() - timedelta(days=ttl_days)).isoformat())
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        stored = {}
+        for key, *values in rows:
+            track = dict(zip(STORED_FIELDS, values))
+            track['found'] = bool(track['found'])
+            stored[key] = {field: value for field, value in track.items() if value is not None}
+        return stored
+
+    def save(self, track):
+        """Записывает результат трека (заменяя прежний)."""
+        values = [track.get(field) for field in STORED_FIELDS]
+        values[STORED_FIELDS.index('found')] = int(bool(track.get('found')))
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO results (key, {', '.join(STORED_FIELDS)}, updated_at) "
+                f"VALUES ({', '.join('?' * (len(STORED_FIELDS) + 2))})",
+                [track_key(track['artist'], track['title'])] + values + [datetime.now().isoformat()]
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def restore_results(tracks, stored, retry_failed=False):
+    """
+    Подставляет сохраненные результаты в треки.
+
+    Returns:
+        (restored, pending): треки с готовым результатом и треки для поиска.
+        Результаты из FINAL_STATUSES восстанавливаются всегда, из
+        RETRY_STATUSES - если не задан retry_failed; треки без результата
+        или с любым другим статусом ищутся заново.
+    """
+    restored, pending = [], []
+    for track in tracks:
+        result = stored.get(track_key(track['artist'], track['title']))
+        status = result['status'] if result is not None else None
+        if status not in FINAL_STATUSES and (retry_failed or status not in RETRY_STATUSES):
+            pending.append(track)
+        else:
+            # Артист и название берем из входного файла: ключ не различает регистр
+            apply_result(track, result)
+            restored.append(track)
+    return restored, pending
@@ -0,0 +1,165 @@
+"""
+Сменные способы поиска треков на сайте.
+
+SearchBackend.search(track) заполняет status/found/page_url/search_query
+у словаря трека. Браузерный поиск (SeleniumSearchBackend) живет в
+full_parser_with_csv.py; здесь - общий разбор страницы результатов и
+HttpSearchBackend, который обращается к поисковому адресу сайта напрямую
+через пул HTTP-соединений с cookies авторизованной сессии браузера.
+"""
+import time
+import logging
+import threading
+from abc import ABC, abstractmethod
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+NOT_FOUND_INDICATORS = ['no results', 'not found', '0 results', 'nothing found']
+
+
+class RequestThrottle:
+    """Общий для всех потоков предел частоты запросов к сайту."""
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def wait(self):
+        """Ждет, пока с начала предыдущего запроса пройдет min_interval секунд."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_time)
+            self._next_time = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def classify_page(track, page_text):
+    """Определяет статус трека по тексту страницы результатов (в нижнем регистре)."""
+    if any(indicator in page_text for indicator in NOT_FOUND_INDICATORS):
+        track['found'] = False
+        track['status'] = 'not_found'
+    # Упрощенная проверка на наличие названия трека или артиста
+    elif track['title'].lower() in page_text or track['artist'].lower() in page_text:
+        track['found'] = True
+        track['status'] = 'found'
+    else:
+        track['status'] = 'unknown'
+    return track
+
+
+class _TextExtractor(HTMLParser):
+    """Собирает видимый текст HTML-страницы (без script и style)."""
+
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ('script', 'style'):
+            self._skip += 1
+
+    def handle_endtag(self, tag):
+        if tag in ('script', 'style') and self._skip:
+            self._skip -= 1
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+
+def html_to_text(html):
+    """Возвращает текст страницы, как его видит пользователь (приблизительно)."""
+    extractor = _TextExtractor()
+    extractor.feed(html)
+    extractor.close()
+    return ' '.join(' '.join(extractor.parts).split())
+
+
+class SessionExpiredError(Exception):
+    """Сайт перенаправил запрос на страницу входа."""
+
+
+class SearchBackend(ABC):
+    """Интерфейс поиска трека."""
+
+    name = 'base'
+
+    @abstractmethod
+    def search(self, track):
+        """Ищет трек и возвращает его с заполненным статусом."""
+        raise NotImplementedError
+
+    def close(self):
+        """Освобождает ресурсы (браузер, соединения)."""
+
+
+class HttpSearchBackend(SearchBackend):
+    """
+    Поиск прямым HTTP-запросом к поисковому адресу сайта.
+
+    Использует cookies авторизованного браузера, поэтому повторный вход не
+    нужен. Один экземпляр можно использовать из нескольких потоков: пул
+    соединений общий. При сетевой ошибке или истекшей сессии трек ищется
+    через fallback (обычно SeleniumSearchBackend), если он задан.
+    """
+
+    name = 'http'
+
+    def __init__(self, search_url, cookies, query_param='q', login_url=None, user_agent=None,
+                 throttle=None, fallback=None, pool_size=10, timeout=30):
+        self.search_url = search_url
+        self.query_param = query_param
+        self.login_path = urlsplit(login_url).path if login_url else None
+        self.throttle = throttle
+        self.fallback = fallback
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        if user_agent:
+            self.session.headers['User-Agent'] = user_agent
+        for cookie in cookies:
+            self.session.cookies.set(cookie['name'], cookie['value'],
+                                     domain=cookie.get('domain', ''), path=cookie.get('path', '/'))
+
+    def search(self, track):
+        if not track['title'] or not track['artist']:
+            track['status'] = 'error'
+            track['error'] = 'Missing title or artist'
+            return track
+
+        search_query = f"{track['artist']} {track['title']}"
+        try:
+            if self.throttle is not None:
+                self.throttle.wait()
+            response = self.session.get(self.search_url, params={self.query_param: search_query},
+                                        timeout=self.timeout)
+            response.raise_for_status()
+            if self.login_path and urlsplit(response.url).path == self.login_path:
+                raise SessionExpiredError("сессия истекла, сайт запросил вход")
+        except (requests.RequestException, SessionExpiredError) as e:
+            if self.fallback is not None:
+                logger.warning(f"HTTP-поиск {track['artist']} - {track['title']} не удался ({e}), "
+                               f"ищу через {self.fallback.name}")
+                return self.fallback.search(track)
+            logger.error(f"Ошибка при поиске трека {track['artist']} - {track['title']}: {e}")
+            track['status'] = 'error'
+            track['error'] = str(e)
+            return track
+
+        track['page_url'] = response.url
+        track['search_query'] = search_query
+        return classify_page(track, html_to_text(response.text).lower())
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,57 @@
+"""
+Тесты search_tracks: ошибка поиска одного трека не теряет остальные.
+"""
+import pytest
+
+from search_backends import SearchBackend
+from full_parser_with_csv import search_tracks
+
+
+class FlakyBackend(SearchBackend):
+    """Находит все треки, кроме указанного: на нем search бросает исключение."""
+
+    def __init__(self, failing_title):
+        self.failing_title = failing_title
+
+    def search(self, track):
+        if track['title'] == self.failing_title:
+            raise RuntimeError("сессия браузера потеряна")
+        track['status'] = 'found'
+        track['found'] = True
+        return track
+
+
+def _tracks(count):
+    return [{'title': f"Song {i}", 'artist': f"Artist {i}", 'status': 'pending', 'found': False}
+            for i in range(count)]
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_search_error_marks_track_and_continues(workers):
+    tracks = _tracks(10)
+    reported = []
+
+    results = search_tracks(FlakyBackend('Song 3'), tracks, workers=workers, on_result=reported.append)
+
+    assert [t['title'] for t in results] == [f"Song {i}" for i in range(10)]
+    assert len(reported) == 10
+    assert results[3]['status'] == 'error'
+    assert 'сессия браузера потеряна' in results[3]['error']
+    assert all(t['status'] == 'found' for i, t in enumerate(results) if i != 3)
+
+
+def test_extra_backends_continue_after_error():
+    tracks = _tracks(10)
+    created = []
+
+    def make_backend():
+        backend = FlakyBackend('Song 7')
+        created.append(backend)
+        return backend
+
+    results = search_tracks(FlakyBackend('Song 7'), tracks, workers=3, make_backend=make_backend)
+
+    assert len(results) == 10
+    assert [t['status'] for t in results].count('error') == 1
+    assert results[7]['status'] == 'error'
+    assert len(created) == 2
@@ -3,20 +3,131 @@
 """
 import requests
 import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Iterator, List, Optional
+
+from requests.adapters import HTTPAdapter
+
+from rate_limit import TokenBucket, retry_after_seconds
+
+# Поля элементов папки, запрашиваемые по умолчанию
+DEFAULT_ITEM_FIELDS = ["name", "public_url", "type", "path"]
+
+# Повторять можно только идемпотентные запросы
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+SERVER_ERROR_STATUSES = frozenset([500, 502, 503, 504])
+RETRY_STATUSES = SERVER_ERROR_STATUSES | {429}
 
 class YandexDiskClient:
     """Клиент для работы с API Яндекс.Диска."""
     
-    def __init__(self, token: str, base_url: str = "https://cloud-api.yandex.net/v1/disk/resources"):
+    def __init__(self, token: str, base_url: str = "https://cloud-api.yandex.net/v1/disk/resources",
+                 pool_size: int = 10, max_retries: int = 3, backoff: float = 0.5, timeout: float = 20,
+                 max_concurrency: Optional[int] = None, publish_rate: Optional[float] = None):
+        """
+        Args:
+            token: OAuth-токен.
+            base_url: Адрес ресурса API.
+            pool_size: Сколько соединений держать открытыми (не меньше числа потоков).
+            max_retries: Повторов идемпотентного запроса при 429, 5xx и ошибках сети.
+            backoff: Базовая задержка повтора в секундах (удваивается, со случайным разбросом).
+            timeout: Таймаут запроса в секундах.
+            max_concurrency: Общий предел одновременных запросов всех потоков (None - pool_size).
+            publish_rate: Не более publish_rate запросов публикации в секунду на весь
+                клиент, сколько бы папок ни публиковалось одновременно (None - без ограничения).
+        """
         self.token = token
         self.base_url = base_url
         self.headers = {"Authorization": f"OAuth {self.token}"}
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
         self.logger = logging.getLogger(__name__)
 
+        # Общая сессия: соединения переиспользуются (keep-alive) всеми потоками
+        self._adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=True)
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+
+        # Общий предел одновременных запросов, сколько бы потоков ни использовало клиент
+        self._slots = threading.BoundedSemaphore(max_concurrency or pool_size)
+        # Общий предел частоты публикаций; пауза после 429 действует на все потоки
+        self.publish_limiter = TokenBucket(publish_rate) if publish_rate else None
+        self._stats_lock = threading.Lock()
+        self._requests = 0
+        self._retries = 0
+
+    def close(self) -> None:
+        """Закрывает соединения сессии."""
+        self.session.close()
+
+    def stats(self) -> Dict[str, int]:
+        """Счетчики: запросы, повторы, открытые и переиспользованные соединения."""
+        connections = 0
+        pools = self._adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                connections += pool.num_connections
+        with self._stats_lock:
+            requests_sent, retries = self._requests, self._retries
+        return {
+            "requests": requests_sent,
+            "retries": retries,
+            "connections": connections,
+            "reused": max(0, requests_sent - connections),
+        }
+
+    def _retry_delay(self, attempt: int) -> float:
+        """Экспоненциальная задержка со случайным разбросом (full jitter)."""
+        return random.uniform(0, self.backoff * 2 ** attempt)
+
+    def _send(self, method: str, url: str, retry_statuses=RETRY_STATUSES, **kwargs) -> requests.Response:
+        """
+        Отправляет запрос через общую сессию.
+
+        Идемпотентные запросы повторяются до max_retries раз при ошибках сети
+        и ответах из retry_statuses; для 429 учитывается Retry-After.
+        Ответ возвращается без проверки статуса.
+        """
+        retriable = method.upper() in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            with self._stats_lock:
+                self._requests += 1
+            try:
+                with self._slots:
+                    response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if not retriable or attempt >= self.max_retries:
+                    raise
+                delay = self._retry_delay(attempt)
+                self.logger.warning(f"Ошибка сети при запросе к {url}: {e}. Повтор через {delay:.1f} с.")
+            else:
+                if not retriable or attempt >= self.max_retries or response.status_code not in retry_statuses:
+                    return response
+                delay = self._retry_delay(attempt)
+                if response.status_code == 429:
+                    delay = max(delay, retry_after_seconds(response, delay))
+                self.logger.warning(
+                    f"Ответ {response.status_code} на запрос к {url}. Повтор через {delay:.1f} с."
+                )
+                response.close()
+
+            attempt += 1
+            with self._stats_lock:
+                self._retries += 1
+            time.sleep(delay)
+
     def _request(self, method: str, url: str, **kwargs) -> requests.Response:
         """Отправляет запрос к API и обрабатывает базовые ошибки."""
         try:
-            response = requests.request(method, url, headers=self.headers, timeout=20, **kwargs)
+            response = self._send(method, url, **kwargs)
             response.raise_for_status()
             return response
         except requests.HTTPError as e:
@@ -26,49 +137,239 @@ class YandexDiskClient:
             self.logger.error(f"Ошибка сети при запросе к {url}: {e}")
             raise
 
-    def list_items(self, path: str, fields: list = None, limit: int = 100) -> list:
-        """Получает список элементов в указанной папке."""
+    def _fetch_page(self, path: str, item_fields: List[str], limit: int, offset: int,
+                    strict: bool = False) -> dict:
+        """
+        Получает одну страницу содержимого папки (блок _embedded).
+
+        Ошибка API пробрасывается, кроме ответа 404 без strict: тогда папки
+        нет и страница считается пустой.
+        """
         params = {
             "path": path,
-            "fields": ",".join(fields) if fields else "_embedded.items.name,_embedded.items.public_url,_embedded.items.type",
-            "limit": limit
+            "fields": ",".join(["_embedded.total"] + [f"_embedded.items.{f}" for f in item_fields]),
+            "limit": limit,
+            "offset": offset
         }
         try:
             response = self._request("GET", self.base_url, params=params)
-            return response.json().get("_embedded", {}).get("items", [])
-        except requests.HTTPError:
-            # В случае ошибки возвращаем пустой список, чтобы не прерывать выполнение
-            return []
+            return response.json().get("_embedded", {})
+        except requests.HTTPError as e:
+            if strict or e.response.status_code != 404:
+                self.logger.error(f"Не удалось получить элементы {offset}-{offset + limit} папки '{path}'.")
+                raise
+            return {}
+
+    def iter_items(self, path: str, fields: list = None, limit: int = 100,
+                   workers: int = 4, recursive: bool = False) -> Iterator[dict]:
+        """
+        Перебирает все элементы папки постранично.
+
+        Первая страница сообщает общее число элементов, после чего остальные
+        страницы запрашиваются параллельно. Элементы отдаются по мере
+        загрузки, в порядке страниц внутри каждой папки.
+
+        Если папки path нет (404), элементов нет. Любая другая ошибка, а также
+        404 на следующих страницах и во вложенных папках прерывает перебор
+        (requests.HTTPError), чтобы неполный список не выдавался за полный.
+
+        Args:
+            path: Путь к папке на Диске.
+            fields: Поля элементов (по умолчанию name, public_url, type, path).
+            limit: Размер страницы.
+            workers: Количество одновременных запросов.
+            recursive: Обходить вложенные папки.
+        """
+        item_fields = list(fields or DEFAULT_ITEM_FIELDS)
+        if recursive:
+            item_fields += [f for f in ("type", "path") if f not in item_fields]
+
+        # Состояние каждой папки: смещение следующей отдаваемой страницы и готовые страницы
+        folders = {}
+        pending = {}
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            def submit(folder: str, offset: int) -> None:
+                strict = offset > 0 or folder != path
+                future = pool.submit(self._fetch_page, folder, item_fields, limit, offset, strict)
+                pending[future] = (folder, offset)
+
+            def add_folder(folder: str) -> None:
+                folders[folder] = {"next": 0, "pages": {}}
+                submit(folder, 0)
+
+            add_folder(path)
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        folder, offset = pending.pop(future)
+                        page = future.result()
+                        state = folders[folder]
+                        if offset == 0:
+                            for next_offset in range(limit, page.get("total", 0), limit):
+                                submit(folder, next_offset)
+                        state["pages"][offset] = page.get("items", [])
 
-    def publish(self, path: str) -> bool:
-        """Публикует ресурс (файл или папку)."""
+                        while state["next"] in state["pages"]:
+                            items = state["pages"].pop(state["next"])
+                            state["next"] += limit
+                            for item in items:
+                                if recursive and item.get("type") == "dir":
+                                    add_folder(item.get("path") or f"{folder}/{item['name']}")
+                                yield item
+            finally:
+                # Если перебор прерван, не ждем ненужных страниц
+                for future in pending:
+                    future.cancel()
+
+    def list_items(self, path: str, fields: list = None, limit: int = 100,
+                   workers: int = 4, recursive: bool = False) -> list:
+        """Получает список всех элементов в указанной папке (все страницы, см. iter_items)."""
+        if fields:
+            fields = [f.replace("_embedded.items.", "") for f in fields]
+        return list(self.iter_items(path, fields=fields, limit=limit,
+                                    workers=workers, recursive=recursive))
+
+    def _publish(self, path: str, limiter: Optional[TokenBucket] = None, max_attempts: int = 1) -> dict:
+        """
+        Публикует ресурс и возвращает результат по пути.
+
+        Ответ 429 повторяется до max_attempts раз после паузы из Retry-After;
+        при общем limiter пауза действует на все потоки.
+
+        Returns:
+            dict: {"path", "ok", "status", "error", "href", "public_url"}. href -
+            ссылка из ответа API: на ресурс или, для ответа 202, на операцию.
+        """
         url = f"{self.base_url}/publish"
         params = {"path": path}
-        try:
-            # Используем другой метод _request, т.к. 409 - не ошибка для нас
-            response = requests.put(url, headers=self.headers, params=params, timeout=20)
+        result = {"path": path, "ok": False, "status": None, "error": None,
+                  "href": None, "public_url": None}
+
+        for attempt in range(1, max_attempts + 1):
+            if limiter is not None:
+                limiter.acquire()
+            try:
+                # Не используем _request, т.к. 409 - не ошибка для нас.
+                # Ответ 429 повторяется только ниже, чтобы попытки и паузы не умножались
+                response = self._send("PUT", url, params=params, retry_statuses=SERVER_ERROR_STATUSES)
+            except requests.RequestException as e:
+                self.logger.error(f"Не удалось опубликовать '{path}': {e}")
+                result["error"] = str(e)
+                return result
+
+            result["status"] = response.status_code
+            if response.status_code == 429 and attempt < max_attempts:
+                delay = retry_after_seconds(response)
+                self.logger.warning(
+                    f"Превышен лимит запросов при публикации '{path}', повтор через {delay:.1f} с."
+                )
+                if limiter is not None:
+                    limiter.pause(delay)
+                else:
+                    time.sleep(delay)
+                continue
+
             if response.status_code in [200, 202]:
                 self.logger.info(f"Ресурс '{path}' успешно опубликован.")
-                return True
-            if response.status_code == 409: # Уже опубликован
+                result["ok"] = True
+                try:
+                    link = response.json()
+                except ValueError:
+                    link = {}
+                result["href"] = link.get("href")
+                result["public_url"] = link.get("public_url")
+            elif response.status_code == 409: # Уже опубликован
                 self.logger.info(f"Ресурс '{path}' уже был опубликован ранее.")
-                return True
-            
-            # Если код другой, вызываем raise_for_status для логирования
-            response.raise_for_status()
-            
-        except requests.RequestException as e:
-            self.logger.error(f"Не удалось опубликовать '{path}': {e}")
-        return False
+                result["ok"] = True
+            else:
+                result["error"] = f"HTTP {response.status_code}"
+                self.logger.error(f"Не удалось опубликовать '{path}': {response.status_code} {response.text}")
+            return result
+
+        return result
+
+    def publish(self, path: str, max_attempts: int = 3) -> dict:
+        """Публикует ресурс (файл или папку). Возвращает результат _publish."""
+        return self._publish(path, self.publish_limiter, max_attempts)
+
+    def publish_many(self, paths: List[str], workers: int = 8, max_attempts: int = 3) -> Dict[str, dict]:
+        """
+        Публикует ресурсы параллельно с общим для клиента пределом publish_rate.
 
-    def get_resource_info(self, path: str, fields: list = None) -> dict:
-        """Получает информацию о ресурсе (файле или папке)."""
+        Args:
+            paths: Пути к ресурсам на Диске.
+            workers: Количество одновременных запросов.
+            max_attempts: Попыток на ресурс при ответе 429.
+
+        Returns:
+            Dict[str, dict]: Результат _publish для каждого пути в порядке paths.
+        """
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(lambda path: self._publish(path, self.publish_limiter, max_attempts), paths)
+            return {result["path"]: result for result in results}
+
+    def get_resource_info(self, path: str, fields: list = None, limit: int = None) -> dict:
+        """Получает информацию о ресурсе (файле или папке); limit ограничивает _embedded папки."""
         params = {
             "path": path,
             "fields": ",".join(fields) if fields else "name,public_url"
         }
+        if limit is not None:
+            params["limit"] = limit
         try:
             response = self._request("GET", self.base_url, params=params)
             return response.json()
         except requests.HTTPError:
             return {}
+
+    def last_uploaded(self, limit: int = 100, fields: list = None) -> list:
+        """Получает последние загруженные на Диск файлы (новые сначала)."""
+        params = {
+            "limit": limit,
+            "fields": ",".join(f"items.{f}" for f in (fields or DEFAULT_ITEM_FIELDS))
+        }
+        try:
+            response = self._request("GET", f"{self.base_url}/last-uploaded", params=params)
+            return response.json().get("items", [])
+        except requests.HTTPError:
+            return []
+
+    def _wait_for_public_url(self, path: str, deadline: float, initial_delay: float,
+                             max_delay: float) -> dict:
+        """Опрашивает ресурс, пока у него не появится public_url или не истечет время."""
+        delay = initial_delay
+        info = {}
+        while True:
+            try:
+                info = self.get_resource_info(path, fields=DEFAULT_ITEM_FIELDS) or info
+            except requests.RequestException:
+                pass
+            if info.get("public_url"):
+                return info
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.logger.warning(f"Ссылка на '{path}' не появилась за отведенное время.")
+                return info
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, max_delay)
+
+    def wait_for_public_urls(self, paths: List[str], workers: int = 8, timeout: float = 60.0,
+                             initial_delay: float = 0.2, max_delay: float = 5.0) -> Dict[str, dict]:
+        """
+        Параллельно дожидается публичных ссылок на опубликованные ресурсы.
+
+        Каждый ресурс опрашивается с нарастающей задержкой (от initial_delay,
+        удваивается до max_delay), пока в его метаданных не появится public_url.
+
+        Returns:
+            Dict[str, dict]: Метаданные ресурса (name, public_url, type, path) для
+            каждого пути в порядке paths; без public_url, если время истекло.
+        """
+        deadline = time.monotonic() + timeout
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            infos = pool.map(
+                lambda path: self._wait_for_public_url(path, deadline, initial_delay, max_delay), paths
+            )
+            return dict(zip(paths, infos))
@@ -0,0 +1,6 @@
+"""
+Локальный заменитель API Яндекс.Диска и бенчмарки Get_links_YD.
+
+Запуск из папки Get_links_YD:
+    python -m benchmark.run --sizes 10 100 1000 10000
+"""
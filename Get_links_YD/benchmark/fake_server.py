@@ -0,0 +1,356 @@
+"""
+Локальный заменитель REST API Яндекс.Диска для тестов и бенчмарков.
+
+Реализует то, чем пользуется YandexDiskClient:
+    GET  /v1/disk/resources               метаданные ресурса, для папки - _embedded с limit/offset
+    GET  /v1/disk/resources/last-uploaded последние загруженные файлы
+    PUT  /v1/disk/resources/publish       публикация: 200, 202 (асинхронно) или 409 (уже опубликован)
+    GET  /v1/disk/operations/<id>         статус асинхронной публикации
+
+Задержка ответа и доля ответов 429/5xx настраиваются. Параметр fields
+игнорируется: ресурсы всегда возвращаются целиком.
+
+Запуск отдельно из папки Get_links_YD:
+    python -m benchmark.fake_server --files 1000 --port 8080
+"""
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlparse, parse_qs
+
+API_PREFIX = "/v1/disk"
+DEFAULT_LIMIT = 20
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _normalize(path: str) -> str:
+    if path.startswith("disk:"):
+        path = path[len("disk:"):]
+    return "/" + path.strip("/")
+
+
+class FakeDisk:
+    """Потокобезопасное состояние Диска: папки, файлы, публикации."""
+
+    def __init__(self, publish_delay: float = 0.0):
+        """
+        Args:
+            publish_delay: Через сколько секунд после публикации появляется public_url.
+        """
+        self.publish_delay = publish_delay
+        self._lock = threading.Lock()
+        # Счетчик загрузок задает порядок last-uploaded и время modified
+        self._uploads = 0
+        self._resources: Dict[str, dict] = {"/": self._new_resource("/", "dir")}
+        self._children: Dict[str, List[str]] = {"/": []}
+        # Путь → момент, начиная с которого ресурс опубликован
+        self._published_at: Dict[str, float] = {}
+        # Номер операции → путь асинхронно публикуемого ресурса
+        self._operations: Dict[str, str] = {}
+
+    def _new_resource(self, path: str, kind: str) -> dict:
+        self._uploads += 1
+        name = path.rsplit("/", 1)[-1] or "disk"
+        resource = {
+            "name": name,
+            "path": f"disk:{path}",
+            "type": kind,
+            "modified": (EPOCH + timedelta(seconds=self._uploads)).isoformat(),
+            "created": self._uploads,
+        }
+        if kind == "file":
+            resource["md5"] = hashlib.md5(f"{path}#{self._uploads}".encode()).hexdigest()
+        return resource
+
+    def add_folder(self, path: str) -> None:
+        """Создает папку (и родительские папки)."""
+        path = _normalize(path)
+        with self._lock:
+            self._add(path, "dir")
+
+    def add_file(self, path: str, published: bool = False) -> None:
+        """Создает или перезаписывает файл (и родительские папки)."""
+        path = _normalize(path)
+        with self._lock:
+            self._add(path, "file")
+            if published:
+                self._published_at[path] = 0.0
+
+    def _add(self, path: str, kind: str) -> None:
+        if path in self._resources and kind == "dir":
+            return
+        parent = path.rsplit("/", 1)[0] or "/"
+        if parent not in self._resources:
+            self._add(parent, "dir")
+        if path not in self._resources:
+            self._children[parent].append(path)
+        self._resources[path] = self._new_resource(path, kind)
+        if kind == "dir":
+            self._children.setdefault(path, [])
+
+    def _view(self, path: str, now: float) -> dict:
+        resource = dict(self._resources[path])
+        published_at = self._published_at.get(path)
+        if published_at is not None and now >= published_at:
+            resource["public_url"] = f"https://yadi.sk/d/{hashlib.md5(path.encode()).hexdigest()[:14]}"
+        return resource
+
+    def get(self, path: str, limit: int, offset: int) -> Optional[dict]:
+        """Метаданные ресурса; для папки - страница элементов в _embedded."""
+        path = _normalize(path)
+        now = time.monotonic()
+        with self._lock:
+            if path not in self._resources:
+                return None
+            resource = self._view(path, now)
+            if resource["type"] == "dir":
+                children = sorted(self._children[path])
+                resource["_embedded"] = {
+                    "items": [self._view(child, now) for child in children[offset:offset + limit]],
+                    "limit": limit,
+                    "offset": offset,
+                    "total": len(children),
+                    "path": resource["path"],
+                }
+            return resource
+
+    def last_uploaded(self, limit: int) -> List[dict]:
+        """Последние загруженные файлы, новые сначала."""
+        now = time.monotonic()
+        with self._lock:
+            files = [p for p, r in self._resources.items() if r["type"] == "file"]
+            files.sort(key=lambda p: self._resources[p]["created"], reverse=True)
+            return [self._view(p, now) for p in files[:limit]]
+
+    def publish(self, path: str, asynchronous: bool) -> Tuple[int, Optional[str]]:
+        """Публикует ресурс; возвращает код ответа и номер асинхронной операции."""
+        path = _normalize(path)
+        with self._lock:
+            if path not in self._resources:
+                return 404, None
+            if path in self._published_at:
+                return 409, None
+            if not asynchronous:
+                self._published_at[path] = time.monotonic()
+                return 200, None
+            self._published_at[path] = time.monotonic() + self.publish_delay
+            operation_id = str(len(self._operations) + 1)
+            self._operations[operation_id] = path
+            return 202, operation_id
+
+    def unpublish(self, path: str) -> None:
+        """Отзывает публичную ссылку (как в интерфейсе Диска)."""
+        with self._lock:
+            self._published_at.pop(_normalize(path), None)
+
+    def operation_status(self, operation_id: str) -> Optional[str]:
+        """Статус асинхронной публикации: in-progress или success."""
+        with self._lock:
+            path = self._operations.get(operation_id)
+            if path is None:
+                return None
+            return "success" if time.monotonic() >= self._published_at[path] else "in-progress"
+
+
+class FakeDiskServer:
+    """HTTP-сервер поверх FakeDisk с настраиваемыми задержкой и ошибками."""
+
+    def __init__(self, disk: FakeDisk, host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0, error_rate: float = 0.0, throttle_rate: float = 0.0,
+                 retry_after: float = 0.5, async_ratio: float = 0.0, seed: Optional[int] = None):
+        """
+        Args:
+            disk: Состояние Диска.
+            host, port: Адрес сервера (port=0 - любой свободный).
+            latency: Задержка каждого ответа в секундах.
+            error_rate: Доля ответов 500/503.
+            throttle_rate: Доля ответов 429 с заголовком Retry-After.
+            retry_after: Значение Retry-After в секундах.
+            async_ratio: Доля публикаций, завершающихся асинхронно (ответ 202).
+            seed: Начальное значение генератора случайных ошибок.
+        """
+        self.disk = disk
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.async_ratio = async_ratio
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._counts_lock = threading.Lock()
+        self.counts: Dict[str, int] = {}
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Адрес для YandexDiskClient(base_url=...)."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}/resources"
+
+    def start(self) -> "FakeDiskServer":
+        """Запускает сервер в фоновом потоке."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Обслуживает запросы в текущем потоке до Ctrl+C."""
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_counts(self) -> None:
+        with self._counts_lock:
+            self.counts = {}
+
+    def _count(self, key: str) -> None:
+        with self._counts_lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def _roll(self) -> float:
+        with self._random_lock:
+            return self._random.random()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: Optional[dict] = None, headers: Optional[dict] = None) -> None:
+                data = json.dumps(body or {}, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _error(self, status: int, error: str) -> None:
+                self._send(status, {"error": error, "description": error})
+
+            def _inject(self) -> bool:
+                """Задержка и случайные ошибки; True, если ответ уже отправлен."""
+                server._count("requests")
+                if server.latency:
+                    time.sleep(server.latency)
+                roll = server._roll()
+                if roll < server.throttle_rate:
+                    server._count("429")
+                    self._send(429, {"error": "TooManyRequestsError"},
+                               {"Retry-After": f"{server.retry_after:g}"})
+                    return True
+                if roll < server.throttle_rate + server.error_rate:
+                    status = 500 if roll < server.throttle_rate + server.error_rate / 2 else 503
+                    server._count(str(status))
+                    self._error(status, "InternalServerError")
+                    return True
+                return False
+
+            def _query(self):
+                url = urlparse(self.path)
+                return url.path, {k: v[0] for k, v in parse_qs(url.query).items()}
+
+            def do_GET(self):
+                if self._inject():
+                    return
+                route, query = self._query()
+                try:
+                    limit = int(query.get("limit", DEFAULT_LIMIT))
+                    offset = int(query.get("offset", 0))
+                except ValueError:
+                    return self._error(400, "FieldValidationError")
+
+                if route == f"{API_PREFIX}/resources":
+                    server._count("GET resources")
+                    resource = server.disk.get(query.get("path", "/"), limit, offset)
+                    if resource is None:
+                        return self._error(404, "DiskNotFoundError")
+                    return self._send(200, resource)
+                if route == f"{API_PREFIX}/resources/last-uploaded":
+                    server._count("GET last-uploaded")
+                    return self._send(200, {"items": server.disk.last_uploaded(limit), "limit": limit})
+                if route.startswith(f"{API_PREFIX}/operations/"):
+                    server._count("GET operations")
+                    status = server.disk.operation_status(route.rsplit("/", 1)[-1])
+                    if status is None:
+                        return self._error(404, "DiskNotFoundError")
+                    return self._send(200, {"status": status})
+                self._error(404, "NotFound")
+
+            def do_PUT(self):
+                if self._inject():
+                    return
+                route, query = self._query()
+                if route != f"{API_PREFIX}/resources/publish":
+                    return self._error(404, "NotFound")
+                server._count("PUT publish")
+                path = query.get("path", "")
+                status, operation_id = server.disk.publish(path, server._roll() < server.async_ratio)
+                if status == 404:
+                    return self._error(404, "DiskNotFoundError")
+                if status == 409:
+                    return self._error(409, "DiskResourceAlreadyPublishedError")
+                if operation_id is not None:
+                    href = f"{server.base_url.rsplit('/', 1)[0]}/operations/{operation_id}"
+                else:
+                    href = f"{server.base_url}?{urlencode({'path': path})}"
+                self._send(status, {"href": href, "method": "GET", "templated": False})
+
+        return Handler
+
+
+def make_folder(disk: FakeDisk, folder: str, files: int, published: float = 0.0,
+                extensions=(".mov", ".mp4"), seed: int = 0) -> None:
+    """Заполняет папку files видеофайлами; доля published уже опубликована."""
+    rng = random.Random(seed)
+    disk.add_folder(folder)
+    for i in range(files):
+        ext = extensions[i % len(extensions)]
+        disk.add_file(f"{folder}/interview_{i:05d}{ext}", published=rng.random() < published)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Локальный заменитель API Яндекс.Диска")
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--folder', default="/Видео/Репортаж")
+    parser.add_argument('--files', type=int, default=100, help="Количество файлов в папке")
+    parser.add_argument('--published', type=float, default=0.0, help="Доля уже опубликованных файлов")
+    parser.add_argument('--latency', type=float, default=0.02, help="Задержка ответа в секундах")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Доля ответов 5xx")
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help="Доля ответов 429")
+    parser.add_argument('--async-ratio', type=float, default=0.5, help="Доля асинхронных публикаций (202)")
+    parser.add_argument('--publish-delay', type=float, default=0.5,
+                        help="Задержка появления ссылки после асинхронной публикации")
+    args = parser.parse_args()
+
+    disk = FakeDisk(publish_delay=args.publish_delay)
+    make_folder(disk, args.folder, args.files, args.published)
+    server = FakeDiskServer(disk, port=args.port, latency=args.latency, error_rate=args.error_rate,
+                            throttle_rate=args.throttle_rate, async_ratio=args.async_ratio)
+    print(f"API_BASE_URL = \"{server.base_url}\"")
+    print(f"FOLDER_PATH = \"{args.folder}\"")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Замер производительности Get_links_YD на локальном заменителе API.
+
+Для каждого размера папки выполняется сценарий main.py (список папки,
+публикация, ожидание ссылок) дважды: с пустым кэшем («холодный» запуск)
+и повторно с заполненным кэшем («теплый»).
+
+Запуск из папки Get_links_YD:
+    python -m benchmark.run --sizes 10 100 1000 10000 --latency 0.02
+    python -m benchmark.run --compare benchmark/results/old.json benchmark/results/new.json
+"""
+import os
+import sys
+import json
+import time
+import types
+import logging
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from benchmark.fake_server import FakeDisk, FakeDiskServer, make_folder
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+FOLDER = "/Бенчмарк/Репортаж"
+
+
+def configure(args: argparse.Namespace):
+    """Подставляет параметры бенчмарка в config (при отсутствии config.py - в новый модуль)."""
+    try:
+        import config
+    except ImportError:
+        config = types.ModuleType("config")
+        sys.modules["config"] = config
+    config.ALLOWED_EXTENSIONS = getattr(config, "ALLOWED_EXTENSIONS", [".mov", ".mp4"])
+    config.LIST_WORKERS = args.list_workers
+    config.PUBLISH_WORKERS = args.publish_workers
+    config.PUBLISH_TIMEOUT = args.publish_timeout
+    return config
+
+
+def run_once(args: argparse.Namespace, files: int, seed: int) -> Dict[str, Any]:
+    """Холодный и теплый запуск сценария для папки из files файлов."""
+    # main импортирует config при загрузке, поэтому импортируем после configure
+    from main import process_folder
+    from api_client import YandexDiskClient
+    from cache import ResourceCache
+
+    disk = FakeDisk(publish_delay=args.publish_delay)
+    make_folder(disk, FOLDER, files, published=args.published, seed=seed)
+    server = FakeDiskServer(disk, latency=args.latency, error_rate=args.error_rate,
+                            throttle_rate=args.throttle_rate, async_ratio=args.async_ratio,
+                            seed=seed).start()
+    phases = {}
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_path = os.path.join(tmp, 'cache.json')
+            for phase in ('cold', 'warm'):
+                client = YandexDiskClient(token="benchmark", base_url=server.base_url,
+                                          pool_size=args.pool_size, backoff=0.05,
+                                          publish_rate=args.publish_rate)
+                cache = ResourceCache(cache_path)
+                server.reset_counts()
+
+                started = time.perf_counter()
+                folder_info, video_files = process_folder(client, cache, FOLDER)
+                seconds = time.perf_counter() - started
+                cache.save()
+
+                stats = client.stats()
+                client.close()
+                phases[phase] = {
+                    'seconds': seconds,
+                    'files_per_second': files / seconds if seconds else None,
+                    'links': sum(1 for item in video_files if item.get("public_url")),
+                    'folder_link': bool(folder_info.get("public_url")),
+                    'server': dict(server.counts),
+                    'client': stats,
+                }
+    finally:
+        server.stop()
+    return phases
+
+
+def bench_size(args: argparse.Namespace, files: int) -> Dict[str, Any]:
+    """Лучшее по времени из repeat повторов для каждой фазы."""
+    best: Dict[str, Dict[str, Any]] = {}
+    for attempt in range(args.repeat):
+        for phase, values in run_once(args, files, args.seed + attempt).items():
+            if phase not in best or values['seconds'] < best[phase]['seconds']:
+                best[phase] = values
+    return {'files': files, 'phases': best}
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=BENCH_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args: argparse.Namespace) -> str:
+    """Выполняет замеры для всех размеров и сохраняет результаты в JSON"""
+    results = []
+    for files in args.sizes:
+        entry = bench_size(args, files)
+        results.append(entry)
+        for phase, values in entry['phases'].items():
+            print(f"{files:>7} файлов, {phase:<4}: {values['seconds']:.2f} с "
+                  f"({values['files_per_second']:.0f} файлов/с), "
+                  f"запросов {values['client']['requests']}, повторов {values['client']['retries']}, "
+                  f"ссылок {values['links']}/{files}")
+
+    report = {
+        'date': datetime.now().isoformat(),
+        'revision': _git_revision(),
+        'python': platform.python_version(),
+        'host': platform.node(),
+        'settings': {k: v for k, v in vars(args).items() if k not in ('sizes', 'output', 'compare')},
+        'results': results,
+    }
+    output_path = args.output
+    if output_path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output_path = os.path.join(RESULTS_DIR, f"bench_{datetime.now():%Y%m%d_%H%M%S}.json")
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Результаты сохранены в {output_path}")
+    return output_path
+
+
+def compare(old_path: str, new_path: str) -> None:
+    """Печатает отношение времени и числа запросов нового запуска к старому"""
+    with open(old_path, 'r', encoding='utf-8') as f:
+        old = {r['files']: r['phases'] for r in json.load(f)['results']}
+    with open(new_path, 'r', encoding='utf-8') as f:
+        new = {r['files']: r['phases'] for r in json.load(f)['results']}
+
+    for files in sorted(set(old) & set(new)):
+        for phase in new[files]:
+            if phase not in old[files]:
+                continue
+            o, n = old[files][phase], new[files][phase]
+            print(f"{files:>7} файлов, {phase:<4}: {o['seconds']:.2f} → {n['seconds']:.2f} с "
+                  f"(x{n['seconds'] / o['seconds']:.2f}), запросов "
+                  f"{o['client']['requests']} → {n['client']['requests']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк Get_links_YD на локальном заменителе API")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="Количество файлов в папке (от 10 до 10000)")
+    parser.add_argument('--repeat', type=int, default=1, help="Количество повторов каждого замера")
+    parser.add_argument('--seed', type=int, default=0, help="Начальное значение генератора")
+    parser.add_argument('--published', type=float, default=0.0, help="Доля уже опубликованных файлов")
+    parser.add_argument('--latency', type=float, default=0.02, help="Задержка ответа сервера в секундах")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Доля ответов 5xx")
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help="Доля ответов 429")
+    parser.add_argument('--async-ratio', type=float, default=0.5, help="Доля асинхронных публикаций (202)")
+    parser.add_argument('--publish-delay', type=float, default=0.5,
+                        help="Через сколько секунд после асинхронной публикации появляется ссылка")
+    parser.add_argument('--pool-size', type=int, default=10, help="POOL_SIZE клиента")
+    parser.add_argument('--list-workers', type=int, default=4, help="LIST_WORKERS")
+    parser.add_argument('--publish-workers', type=int, default=8, help="PUBLISH_WORKERS")
+    parser.add_argument('--publish-rate', type=float, default=None,
+                        help="PUBLISH_RATE (по умолчанию без ограничения, чтобы мерить сам клиент)")
+    parser.add_argument('--publish-timeout', type=float, default=60.0, help="PUBLISH_TIMEOUT")
+    parser.add_argument('--output', default=None, help="Путь к JSON с результатами")
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'),
+                        help="Сравнить два сохраненных результата")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.compare:
+        compare(*args.compare)
+    else:
+        configure(args)
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Локальный кэш метаданных ресурсов Яндекс.Диска для инкрементальной синхронизации.
+
+Для каждой папки хранится ее имя, публичная ссылка и элементы
+(путь → name, type, modified, md5, public_url). При повторном запуске
+полный список папки не запрашивается, если число элементов в ней не
+изменилось, а среди последних загруженных на Диск файлов нет новых или
+измененных файлов этой папки.
+
+Так нельзя заметить изменения, которые не меняют число элементов и не
+попадают в последние загрузки: отозванную в интерфейсе Диска ссылку или
+переименованный файл. Поэтому папка перечитывается полностью, если с
+последнего полного чтения прошло больше max_age секунд или запрошено
+обновление (force).
+"""
+import os
+import json
+import time
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from api_client import YandexDiskClient
+
+# Поля элементов, сохраняемые в кэше
+CACHE_ITEM_FIELDS = ["name", "type", "path", "public_url", "modified", "md5"]
+CACHE_VERSION = 1
+
+
+def normalize_path(path: str) -> str:
+    """Приводит путь к виду '/папка/файл' (без префикса 'disk:' и '/' в конце)."""
+    if path.startswith("disk:"):
+        path = path[len("disk:"):]
+    return path.rstrip("/") or "/"
+
+
+class ResourceCache:
+    """JSON-индекс ресурсов по папкам."""
+
+    def __init__(self, path: str, max_age: Optional[float] = None):
+        """
+        Args:
+            path: Файл кэша.
+            max_age: Через сколько секунд после полного чтения папки перечитывать
+                ее полностью (None - только при изменении числа элементов).
+        """
+        self.path = path
+        self.max_age = max_age
+        self.logger = logging.getLogger(__name__)
+        self.folders: Dict[str, dict] = {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                self.folders = data.get("folders", {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Кэш '{path}' не прочитан и будет создан заново: {e}")
+
+    def save(self) -> None:
+        """Атомарно сохраняет кэш."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "folders": self.folders}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def update(self, folder: str, folder_info: dict, items: List[dict]) -> None:
+        """Обновляет в кэше ссылку на папку и данные элементов (например, после публикации)."""
+        entry = self.folders.setdefault(normalize_path(folder), {"name": None, "public_url": None, "items": {}})
+        entry["name"] = folder_info.get("name", entry["name"])
+        entry["public_url"] = folder_info.get("public_url") or entry["public_url"]
+        for item in items:
+            key = normalize_path(item.get("path") or f"{folder}/{item['name']}")
+            entry["items"].setdefault(key, {}).update(item)
+
+    def _probe_changes(self, client: YandexDiskClient, folder: str, cached: Dict[str, dict],
+                       probe_limit: int) -> Optional[List[dict]]:
+        """
+        Ищет новые и измененные файлы папки среди последних загруженных на Диск.
+
+        Returns:
+            Список измененных элементов или None, если по выборке нельзя
+            гарантировать, что найдены все изменения.
+        """
+        recent = client.last_uploaded(limit=probe_limit, fields=CACHE_ITEM_FIELDS)
+        changed = []
+        reached_known = len(recent) < probe_limit
+        for item in recent:
+            key = normalize_path(item.get("path", ""))
+            known = cached.get(key)
+            if known is not None and known.get("md5") == item.get("md5") \
+                    and known.get("modified") == item.get("modified"):
+                # Дальше идут файлы, загруженные раньше уже известного
+                reached_known = True
+                break
+            if key.rsplit("/", 1)[0] == folder:
+                changed.append(item)
+        return changed if reached_known else None
+
+    def _expired(self, entry: dict) -> bool:
+        if self.max_age is None:
+            return False
+        return time.time() - entry.get("listed_at", 0) > self.max_age
+
+    def sync(self, client: YandexDiskClient, folder: str, workers: int = 4,
+             probe_limit: int = 100, force: bool = False) -> Tuple[dict, List[dict]]:
+        """
+        Возвращает информацию о папке и ее элементы, обновляя кэш.
+
+        Сначала запрашиваются имя, ссылка и число элементов папки, затем -
+        последние загруженные файлы. Полный список папки читается, только если
+        кэша нет, число элементов не сходится, изменения не удалось
+        определить по последним загрузкам, кэш папки старше max_age или
+        задан force.
+
+        Returns:
+            (folder_info, items): folder_info с полями name и public_url.
+        """
+        key = normalize_path(folder)
+        summary = client.get_resource_info(folder, fields=["name", "public_url", "_embedded.total"], limit=1)
+        if not summary:
+            return {}, []
+        folder_info = {"name": summary.get("name"), "public_url": summary.get("public_url")}
+        total = summary.get("_embedded", {}).get("total")
+
+        entry = self.folders.get(key)
+        changed = None
+        if entry is not None and total is not None and not force and not self._expired(entry):
+            changed = self._probe_changes(client, key, entry["items"], probe_limit)
+
+        if changed is not None:
+            items = dict(entry["items"])
+            for item in changed:
+                items[normalize_path(item["path"])] = item
+            if len(items) == total:
+                if changed:
+                    self.logger.info(f"Кэш папки '{folder}': обновлено элементов: {len(changed)}")
+                    items = dict(sorted(items.items(), key=lambda pair: pair[1].get("name", "")))
+                else:
+                    self.logger.info(f"Кэш папки '{folder}' актуален.")
+                entry.update(folder_info, items=items)
+                return folder_info, list(items.values())
+
+        self.logger.info(f"Читаю полный список папки '{folder}'...")
+        listed = client.list_items(folder, fields=CACHE_ITEM_FIELDS, workers=workers)
+        self.folders[key] = dict(
+            folder_info, listed_at=time.time(),
+            items={normalize_path(item.get("path") or f"{key}/{item['name']}"): item for item in listed}
+        )
+        return folder_info, listed
@@ -0,0 +1,20 @@
+"""
+Общие настройки тестов Get_links_YD.
+
+Запуск из папки Get_links_YD:
+    python -m pytest
+"""
+import sys
+import types
+
+# Если config.py не заполнен, тесты используют собственные настройки
+try:
+    import config
+except ImportError:
+    config = types.ModuleType('config')
+    config.OAUTH_TOKEN = 'test'
+    config.API_BASE_URL = 'http://127.0.0.1/v1/disk/resources'
+    config.FOLDER_PATH = '/'
+    config.OUTPUT_FILE = 'links.txt'
+    config.ALLOWED_EXTENSIONS = ['.mov', '.mp4']
+    sys.modules['config'] = config
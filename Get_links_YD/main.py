@@ -1,12 +1,18 @@
 """
 Главный скрипт для получения публичных ссылок на файлы из Яндекс.Диска.
 """
+import argparse
 import logging
-import time
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+import requests
 
 import config
 from api_client import YandexDiskClient
+from cache import ResourceCache, normalize_path
 from file_formatter import format_report
 
 # Настройка логирования
@@ -16,58 +22,140 @@ logging.basicConfig(
     handlers=[logging.StreamHandler()]
 )
 
-def main():
-    """Основная функция, координирующая процесс."""
-    logger = logging.getLogger(__name__)
-    logger.info(f"Начинаю обработку папки: {config.FOLDER_PATH}")
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def parse_args() -> argparse.Namespace:
+    """Разбирает аргументы командной строки."""
+    parser = argparse.ArgumentParser(description="Получение публичных ссылок на файлы из Яндекс.Диска")
+    parser.add_argument('--folders', nargs='+', metavar='PATH',
+                        help="Папки на Диске для пакетной обработки (вместо FOLDER_PATH из config.py)")
+    parser.add_argument('--folders-file', metavar='FILE',
+                        help="Текстовый файл со списком папок, по одной на строку")
+    parser.add_argument('--parent', metavar='PATH',
+                        help="Обработать все вложенные папки указанной папки")
+    parser.add_argument('--combined', action='store_true',
+                        help="В пакетном режиме сохранить один общий отчет вместо отчета на каждую папку")
+    parser.add_argument('--folder-workers', type=int, default=getattr(config, "FOLDER_WORKERS", 4),
+                        help="Сколько папок обрабатывать одновременно (по умолчанию 4)")
+    parser.add_argument('--refresh', action='store_true',
+                        help="Перечитать папки полностью, не доверяя кэшу (отозванные ссылки, "
+                             "переименованные файлы)")
+    parser.add_argument('--max-concurrency', type=int, default=getattr(config, "MAX_CONCURRENCY", None),
+                        help="Общий предел одновременных запросов к API (по умолчанию POOL_SIZE)")
+    return parser.parse_args()
+
+
+def collect_folders(args: argparse.Namespace, client: YandexDiskClient) -> List[str]:
+    """Собирает список папок из аргументов; без них - FOLDER_PATH из config.py."""
+    folders = list(args.folders or [])
+    if args.folders_file:
+        with open(args.folders_file, "r", encoding="utf-8") as f:
+            folders += [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    if args.parent:
+        subfolders = [
+            normalize_path(item.get("path") or f"{args.parent}/{item['name']}")
+            for item in client.list_items(args.parent)
+            if item.get("type") == "dir"
+        ]
+        if not subfolders:
+            logging.getLogger(__name__).warning(f"В папке '{args.parent}' нет вложенных папок.")
+        folders += subfolders
+    if not folders and not (args.folders_file or args.parent):
+        folders = [config.FOLDER_PATH]
+
+    # Убираем повторы, сохраняя порядок
+    return list(dict.fromkeys(normalize_path(folder) for folder in folders))
+
+
+def process_folder(client: YandexDiskClient, cache: ResourceCache, folder: str,
+                   refresh: bool = False) -> Tuple[dict, List[dict]]:
+    """
+    Публикует папку и ее видеофайлы и дожидается ссылок.
 
-    client = YandexDiskClient(token=config.OAUTH_TOKEN, base_url=config.API_BASE_URL)
+    refresh - прочитать папку полностью, даже если кэш считает ее неизменной.
 
-    # 1. Публикуем корневую папку, чтобы убедиться, что она доступна
-    client.publish(config.FOLDER_PATH)
+    Returns:
+        (folder_info, video_files) для format_report; ({}, []), если папка пуста или недоступна.
+    """
+    logger = logging.getLogger(__name__)
+    logger.info(f"Начинаю обработку папки: {folder}")
 
-    # 2. Получаем список всех элементов в папке
-    items = client.list_items(config.FOLDER_PATH)
+    # 1. Получаем элементы папки (из кэша, если в папке ничего не изменилось)
+    folder_info, items = cache.sync(client, folder, workers=getattr(config, "LIST_WORKERS", 4), force=refresh)
     if not items:
-        logger.warning("В папке нет файлов или не удалось получить список.")
-        return
+        logger.warning(f"В папке '{folder}' нет файлов или не удалось получить список.")
+        return {}, []
 
-    # 3. Находим файлы, которые нужно опубликовать
-    files_to_publish = [
+    # 2. Публикуем корневую папку, если она еще не опубликована
+    folder_published = False
+    if not folder_info.get("public_url"):
+        result = client.publish(folder)
+        if result["public_url"]:
+            folder_info = {**folder_info, "public_url": result["public_url"]}
+        # Ждать ссылку имеет смысл, только если публикация принята (ok и для 409)
+        folder_published = result["ok"]
+        if not result["ok"]:
+            logger.warning(f"Не удалось опубликовать папку '{folder}': {result['error']}")
+
+    video_files = [
         item for item in items
         if item.get("type") == "file"
         and os.path.splitext(item.get("name", ""))[1].lower() in config.ALLOWED_EXTENSIONS
-        and not item.get("public_url")
     ]
 
+    # 3. Находим файлы, которые нужно опубликовать
+    files_to_publish = [item for item in video_files if not item.get("public_url")]
+
     # 4. Публикуем найденные файлы
+    pending = []
     if files_to_publish:
-        logger.info(f"Найдено {len(files_to_publish)} файлов для публикации...")
-        for item in files_to_publish:
-            full_path = f"{config.FOLDER_PATH}/{item['name']}"
-            client.publish(full_path)
-        
-        # Пауза, чтобы Яндекс.Диск успел сгенерировать ссылки
-        logger.info("Ожидание 2 секунды для обновления ссылок на сервере...")
-        time.sleep(2.0)
+        logger.info(f"'{folder}': найдено {len(files_to_publish)} файлов для публикации...")
+        paths = [f"{folder}/{item['name']}" for item in files_to_publish]
+        results = client.publish_many(paths, workers=getattr(config, "PUBLISH_WORKERS", 8))
+        failed = [path for path, result in results.items() if not result["ok"]]
+        if failed:
+            logger.warning(f"Не удалось опубликовать {len(failed)} файлов: {', '.join(failed)}")
+
+        for item, path in zip(files_to_publish, paths):
+            result = results[path]
+            if result["public_url"]:
+                item["public_url"] = result["public_url"]
+            elif result["ok"]:
+                pending.append(path)
     else:
-        logger.info("Все видеофайлы в папке уже опубликованы.")
+        logger.info(f"'{folder}': все видеофайлы уже опубликованы.")
 
-    # 5. Получаем финальную информацию (папка + файлы)
-    folder_info = client.get_resource_info(config.FOLDER_PATH)
-    all_files = client.list_items(config.FOLDER_PATH)
+    # 5. Дожидаемся ссылок на папку и только что опубликованные файлы
+    if folder_published and not folder_info.get("public_url"):
+        pending.insert(0, folder)
+    if pending:
+        logger.info(f"'{folder}': ожидание публичных ссылок для {len(pending)} ресурсов...")
+        ready = client.wait_for_public_urls(
+            pending,
+            workers=getattr(config, "PUBLISH_WORKERS", 8),
+            timeout=getattr(config, "PUBLISH_TIMEOUT", 60.0)
+        )
+        folder_info = ready.get(folder, folder_info)
+        for item in files_to_publish:
+            info = ready.get(f"{folder}/{item['name']}")
+            if info and info.get("public_url"):
+                item["public_url"] = info["public_url"]
 
-    video_files = [
-        item for item in all_files
-        if item.get("type") == "file"
-        and os.path.splitext(item.get("name", ""))[1].lower() in config.ALLOWED_EXTENSIONS
-    ]
+    cache.update(folder, folder_info, files_to_publish)
+    return folder_info, video_files
 
-    # 6. Формируем и сохраняем отчет
-    report = format_report(folder_info, video_files)
-    print("\n" + "-"*20 + "\n" + report)
 
-    output_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), config.OUTPUT_FILE)
+def report_path_for(folder: str) -> str:
+    """Путь отчета папки в пакетном режиме: links_<путь папки>.txt рядом со скриптом."""
+    base, ext = os.path.splitext(config.OUTPUT_FILE)
+    name = re.sub(r'[\\/:*?"<>|]+', '_', folder.strip("/")) or "root"
+    return os.path.join(SCRIPT_DIR, f"{base}_{name}{ext}")
+
+
+def save_report(report: str, output_path: str) -> None:
+    """Сохраняет отчет в файл."""
+    logger = logging.getLogger(__name__)
     try:
         with open(output_path, "w", encoding="utf-8") as f:
             f.write(report)
@@ -75,5 +163,81 @@ def main():
     except IOError as e:
         logger.error(f"Не удалось записать файл '{output_path}': {e}")
 
+
+def main():
+    """Основная функция, координирующая процесс."""
+    logger = logging.getLogger(__name__)
+    args = parse_args()
+
+    pool_size = getattr(config, "POOL_SIZE", 10)
+    client = YandexDiskClient(
+        token=config.OAUTH_TOKEN,
+        base_url=config.API_BASE_URL,
+        pool_size=max(pool_size, args.max_concurrency or 0),
+        max_retries=getattr(config, "MAX_RETRIES", 3),
+        max_concurrency=args.max_concurrency,
+        publish_rate=getattr(config, "PUBLISH_RATE", 10.0)
+    )
+    max_age_hours = getattr(config, "CACHE_MAX_AGE_HOURS", 24)
+    cache = ResourceCache(
+        os.path.join(SCRIPT_DIR, getattr(config, "CACHE_FILE", ".links_cache.json")),
+        max_age=max_age_hours * 3600 if max_age_hours is not None else None
+    )
+
+    try:
+        folders = collect_folders(args, client)
+    except (OSError, requests.RequestException) as e:
+        logger.error(f"Не удалось прочитать список папок: {e}")
+        client.close()
+        return
+    batch = bool(args.folders or args.folders_file or args.parent)
+
+    def run(folder: str):
+        # Ошибка в одной папке не должна останавливать остальные
+        try:
+            return process_folder(client, cache, folder, refresh=args.refresh)
+        except Exception as e:
+            logger.error(f"Ошибка при обработке папки '{folder}': {e}")
+            return None
+
+    if batch:
+        logger.info(f"Пакетный режим: {len(folders)} папок")
+    with ThreadPoolExecutor(max_workers=max(1, args.folder_workers)) as pool:
+        results = list(pool.map(run, folders))
+
+    try:
+        cache.save()
+    except OSError as e:
+        logger.error(f"Не удалось сохранить кэш '{cache.path}': {e}")
+
+    # 6. Формируем и сохраняем отчеты
+    reports = []
+    for folder, result in zip(folders, results):
+        if result is None or not result[0]:
+            continue
+        report = format_report(*result)
+        if not batch:
+            print("\n" + "-"*20 + "\n" + report)
+            save_report(report, os.path.join(SCRIPT_DIR, config.OUTPUT_FILE))
+        elif args.combined:
+            reports.append(report)
+        else:
+            save_report(report, report_path_for(folder))
+    if reports:
+        save_report("\n\n".join(reports), os.path.join(SCRIPT_DIR, config.OUTPUT_FILE))
+
+    failed = [folder for folder, result in zip(folders, results) if result is None or not result[0]]
+    if batch:
+        logger.info(f"Обработано папок: {len(folders) - len(failed)} из {len(folders)}")
+    if failed:
+        logger.warning(f"Папки с ошибками или без файлов: {', '.join(failed)}")
+
+    stats = client.stats()
+    logger.info(
+        f"Запросов к API: {stats['requests']}, повторов: {stats['retries']}, "
+        f"соединений открыто: {stats['connections']}, переиспользовано: {stats['reused']}"
+    )
+    client.close()
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,66 @@
+"""
+Ограничение частоты запросов к API Яндекс.Диска.
+"""
+import time
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import requests
+
+
+class TokenBucket:
+    """
+    Потокобезопасный token bucket: не более rate запросов в секунду
+    с допустимым всплеском capacity.
+
+    pause() останавливает выдачу токенов всем потокам, например на время
+    из заголовка Retry-After ответа 429.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate должен быть больше нуля")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Блокирует поток, пока не будет доступен токен."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now >= self._updated:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    delay = (1 - self._tokens) / self.rate
+                else:
+                    # Идет пауза после 429
+                    delay = self._updated - now
+            time.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        """Приостанавливает выдачу токенов на seconds секунд."""
+        with self._lock:
+            self._tokens = 0.0
+            self._updated = max(self._updated, time.monotonic() + seconds)
+
+
+def retry_after_seconds(response: requests.Response, default: float = 1.0) -> float:
+    """Возвращает задержку из заголовка Retry-After (секунды или HTTP-дата)."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
@@ -0,0 +1,239 @@
+"""
+Тесты постраничного чтения папок YandexDiskClient на локальном заменителе API.
+
+Запуск из папки Get_links_YD:
+    python -m pytest
+"""
+import time
+import threading
+
+import pytest
+import requests
+
+from api_client import YandexDiskClient
+from cache import ResourceCache
+from benchmark.fake_server import FakeDisk, FakeDiskServer, make_folder
+
+
+class FailingDisk(FakeDisk):
+    """Диск, на котором страницы с указанными смещениями недоступны (404)."""
+
+    def __init__(self, fail_offsets=()):
+        super().__init__()
+        self.fail_offsets = set(fail_offsets)
+
+    def get(self, path, limit, offset):
+        if offset in self.fail_offsets:
+            return None
+        return super().get(path, limit, offset)
+
+
+@pytest.fixture
+def serve():
+    servers = []
+    clients = []
+
+    def start(disk, publish_rate=None, **options):
+        server = FakeDiskServer(disk, **options).start()
+        client = YandexDiskClient(token="test", base_url=server.base_url, backoff=0.01,
+                                  publish_rate=publish_rate)
+        servers.append(server)
+        clients.append(client)
+        return server, client
+
+    yield start
+    for client in clients:
+        client.close()
+    for server in servers:
+        server.stop()
+
+
+def _names(items):
+    return [item["name"] for item in items]
+
+
+def test_list_items_reads_all_pages_in_order(serve):
+    disk = FakeDisk()
+    make_folder(disk, "/F", 1000)
+    server, client = serve(disk)
+
+    items = client.list_items("/F", limit=100, workers=4)
+
+    assert _names(items) == [f"interview_{i:05d}{('.mov', '.mp4')[i % 2]}" for i in range(1000)]
+    assert server.counts["GET resources"] == 10
+
+
+def test_list_items_last_partial_page(serve):
+    disk = FakeDisk()
+    make_folder(disk, "/F", 251)
+    _, client = serve(disk)
+
+    assert len(client.list_items("/F", limit=100)) == 251
+
+
+def test_list_items_missing_folder_is_empty(serve):
+    _, client = serve(FakeDisk())
+
+    assert client.list_items("/нет такой папки") == []
+
+
+def test_iter_items_recursive(serve):
+    disk = FakeDisk()
+    make_folder(disk, "/F", 150)
+    make_folder(disk, "/F/sub", 120)
+    make_folder(disk, "/F/sub/deeper", 30)
+    _, client = serve(disk)
+
+    items = list(client.iter_items("/F", limit=50, workers=4, recursive=True))
+    paths = [item["path"] for item in items]
+
+    assert len(items) == 150 + 1 + 120 + 1 + 30
+    assert len(set(paths)) == len(paths)
+    # Внутри каждой папки элементы идут в порядке страниц
+    for folder in ("/F", "/F/sub", "/F/sub/deeper"):
+        own = [p for p in paths if p.rsplit("/", 1)[0] == f"disk:{folder}"]
+        assert own == sorted(own)
+    assert len(client.list_items("/F", limit=50)) == 150 + 1
+
+
+def test_iter_items_close_early_cancels_pages(serve):
+    disk = FakeDisk()
+    make_folder(disk, "/F", 2000)
+    server, client = serve(disk, latency=0.01)
+
+    items = client.iter_items("/F", limit=20, workers=2)
+    first = [next(items) for _ in range(5)]
+    items.close()
+
+    assert _names(first) == [f"interview_{i:05d}{('.mov', '.mp4')[i % 2]}" for i in range(5)]
+    # Из 100 страниц запрошены только первая и уже начатые
+    assert server.counts["GET resources"] < 10
+
+
+@pytest.mark.parametrize("fail_offset", [100, 900])
+def test_failed_page_raises_instead_of_truncating(serve, fail_offset):
+    disk = FailingDisk(fail_offsets=[fail_offset])
+    make_folder(disk, "/F", 1000)
+    _, client = serve(disk)
+
+    with pytest.raises(requests.HTTPError):
+        client.list_items("/F", limit=100, workers=4)
+
+
+def test_failed_subfolder_raises(serve):
+    disk = FailingDisk()
+    make_folder(disk, "/F", 10)
+    disk.add_folder("/F/sub")
+    _, client = serve(disk)
+    disk.fail_offsets.add(0)
+
+    # Корневая папка тоже недоступна, но это "папки нет", а не ошибка
+    assert client.list_items("/F", recursive=True) == []
+    disk.fail_offsets.clear()
+
+    original_get = disk.get
+    disk.get = lambda path, limit, offset: None if path.endswith("/F/sub") else original_get(path, limit, offset)
+    with pytest.raises(requests.HTTPError):
+        client.list_items("/F", recursive=True)
+
+
+def test_server_errors_never_truncate(serve):
+    disk = FakeDisk()
+    make_folder(disk, "/F", 1000)
+    _, client = serve(disk, error_rate=0.3, seed=1)
+    client.max_retries = 1
+
+    raised = 0
+    for _ in range(5):
+        try:
+            items = client.list_items("/F", limit=100, workers=4)
+        except requests.HTTPError:
+            raised += 1
+        else:
+            assert len(items) == 1000
+    assert raised
+
+
+def test_cache_sync_keeps_cache_on_failed_page(serve, tmp_path):
+    disk = FailingDisk()
+    make_folder(disk, "/F", 300)
+    _, client = serve(disk)
+    cache = ResourceCache(str(tmp_path / "cache.json"))
+
+    disk.fail_offsets.add(200)
+    with pytest.raises(requests.HTTPError):
+        cache.sync(client, "/F")
+    assert "/F" not in cache.folders
+
+    disk.fail_offsets.clear()
+    _, items = cache.sync(client, "/F")
+    assert len(items) == 300
+    assert len(cache.folders["/F"]["items"]) == 300
+
+
+def test_publish_rate_is_shared_between_folders(serve):
+    disk = FakeDisk()
+    for folder in ("/A", "/B", "/C"):
+        make_folder(disk, folder, 10)
+    server, client = serve(disk, publish_rate=10)
+
+    results = {}
+
+    def publish(folder):
+        paths = [f"{folder}/interview_{i:05d}{('.mov', '.mp4')[i % 2]}" for i in range(10)]
+        results.update(client.publish_many(paths, workers=8))
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=publish, args=(folder,)) for folder in ("/A", "/B", "/C")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    assert len(results) == 30 and all(result["ok"] for result in results.values())
+    # 30 публикаций при 10 в секунду и запасе в 10 токенов - не быстрее 2 секунд
+    assert elapsed >= 1.9
+    assert server.counts["PUT publish"] == 30
+
+
+def test_retry_after_pauses_every_folder(serve):
+    disk = FakeDisk()
+    make_folder(disk, "/A", 4)
+    _, client = serve(disk, publish_rate=100)
+
+    client.publish_limiter.pause(0.5)
+    started = time.monotonic()
+    client.publish("/A/interview_00000.mov")
+    client.publish_many(["/A/interview_00001.mp4"])
+
+    assert time.monotonic() - started >= 0.45
+
+
+@pytest.mark.parametrize("publish_rate", [None, 100])
+def test_publish_429_is_retried_only_max_attempts_times(serve, publish_rate):
+    disk = FakeDisk()
+    make_folder(disk, "/A", 1)
+    server, client = serve(disk, publish_rate=publish_rate, throttle_rate=1.0, retry_after=0.2)
+
+    started = time.monotonic()
+    result = client.publish("/A/interview_00000.mov", max_attempts=3)
+    elapsed = time.monotonic() - started
+
+    assert not result["ok"] and result["status"] == 429
+    # Три попытки и две паузы Retry-After, без повторов внутри _send
+    assert server.counts["429"] == 3
+    assert 0.35 <= elapsed < 1.0
+
+
+def test_publish_many_waits_for_retry_after(serve):
+    disk = FakeDisk()
+    make_folder(disk, "/A", 20)
+    server, client = serve(disk, throttle_rate=0.3, retry_after=0.1, seed=3)
+
+    paths = [f"/A/interview_{i:05d}{('.mov', '.mp4')[i % 2]}" for i in range(20)]
+    results = client.publish_many(paths, workers=4, max_attempts=10)
+
+    assert all(results[path]["ok"] for path in paths)
+    assert server.counts["429"] > 0
+    assert server.counts["requests"] == 20 + server.counts["429"]
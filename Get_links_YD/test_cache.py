@@ -0,0 +1,65 @@
+"""
+Тесты ResourceCache на локальном заменителе API.
+"""
+import pytest
+
+from api_client import YandexDiskClient
+from cache import ResourceCache
+from benchmark.fake_server import FakeDisk, FakeDiskServer, make_folder
+
+
+@pytest.fixture
+def disk_client():
+    disk = FakeDisk()
+    make_folder(disk, "/F", 30, published=1.0)
+    server = FakeDiskServer(disk).start()
+    client = YandexDiskClient(token="test", base_url=server.base_url, backoff=0.01)
+    yield disk, server, client
+    client.close()
+    server.stop()
+
+
+def _links(items):
+    return {item["name"]: item.get("public_url") for item in items}
+
+
+def test_unchanged_folder_is_not_relisted(disk_client, tmp_path):
+    disk, server, client = disk_client
+    cache = ResourceCache(str(tmp_path / "cache.json"))
+    _, items = cache.sync(client, "/F")
+    cache.save()
+
+    server.reset_counts()
+    _, cached = ResourceCache(cache.path).sync(client, "/F")
+
+    assert _links(cached) == _links(items)
+    # Только число элементов и последние загрузки
+    assert server.counts["requests"] == 2
+
+
+def test_revoked_link_needs_refresh(disk_client, tmp_path):
+    disk, _, client = disk_client
+    cache = ResourceCache(str(tmp_path / "cache.json"))
+    cache.sync(client, "/F")
+    disk.unpublish("/F/interview_00003.mp4")
+
+    # Отзыв ссылки не меняет число элементов: кэш его не видит
+    _, items = cache.sync(client, "/F")
+    assert _links(items)["interview_00003.mp4"]
+
+    _, items = cache.sync(client, "/F", force=True)
+    assert _links(items)["interview_00003.mp4"] is None
+    assert sum(1 for link in _links(items).values() if link) == 29
+
+
+def test_expired_cache_is_relisted(disk_client, tmp_path):
+    disk, server, client = disk_client
+    cache = ResourceCache(str(tmp_path / "cache.json"), max_age=0)
+    cache.sync(client, "/F")
+    disk.unpublish("/F/interview_00003.mp4")
+
+    server.reset_counts()
+    _, items = cache.sync(client, "/F")
+
+    assert _links(items)["interview_00003.mp4"] is None
+    assert "GET last-uploaded" not in server.counts
@@ -0,0 +1,39 @@
+"""
+Тесты process_folder на локальном заменителе API.
+"""
+import time
+
+import config
+from api_client import YandexDiskClient
+from cache import ResourceCache
+from main import process_folder
+from benchmark.fake_server import FakeDisk, FakeDiskServer, make_folder
+
+
+class LockedFolderDisk(FakeDisk):
+    """Диск, на котором папку /F нельзя опубликовать."""
+
+    def publish(self, path, asynchronous):
+        if path.rstrip("/").endswith("/F"):
+            return 404, None
+        return super().publish(path, asynchronous)
+
+
+def test_failed_folder_publish_is_not_awaited(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "PUBLISH_TIMEOUT", 5.0, raising=False)
+    disk = LockedFolderDisk()
+    make_folder(disk, "/F", 6)
+    server = FakeDiskServer(disk).start()
+    client = YandexDiskClient(token="test", base_url=server.base_url, backoff=0.01)
+    try:
+        started = time.monotonic()
+        folder_info, video_files = process_folder(client, ResourceCache(str(tmp_path / "cache.json")), "/F")
+        elapsed = time.monotonic() - started
+    finally:
+        client.close()
+        server.stop()
+
+    assert not folder_info.get("public_url")
+    assert len(video_files) == 6 and all(item.get("public_url") for item in video_files)
+    # Ссылку на папку не ждали до PUBLISH_TIMEOUT
+    assert elapsed < 2.0
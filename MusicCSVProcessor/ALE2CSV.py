@@ -5,9 +5,19 @@
 """
 
 import os
-import glob
 import logging
-from processor import MusicFileProcessor
+import argparse
+import importlib.util
+import time
+from datetime import datetime
+# pandas импортируется лениво (в engines и при построении сводного отчета),
+# чтобы небольшие файлы обрабатывались без затрат на его загрузку
+from engines import EngineSelector, ENGINES, lite_supported
+from parallel import process_files_parallel
+from manifest import Manifest, config_fingerprint
+from watcher import FolderWatcher
+from metrics import write_metrics, default_metrics_path
+from inputs import list_input_files, output_path_for, REPORT_FILENAME, OUTPUT_FORMATS
 
 # Настройка логирования
 logging.basicConfig(
@@ -21,34 +31,198 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+def parse_args():
+    """Разбирает аргументы командной строки"""
+    parser = argparse.ArgumentParser(description="Обработка музыкальных CSV файлов")
+    parser.add_argument(
+        '--chunksize', type=int, default=None,
+        help="Потоковая обработка: читать файлы частями по N строк"
+    )
+    parser.add_argument(
+        '--workers', type=int, default=1,
+        help="Количество процессов для параллельной обработки файлов"
+    )
+    parser.add_argument(
+        '--force', action='store_true',
+        help="Обработать все файлы, даже если они не изменились с прошлого запуска"
+    )
+    parser.add_argument(
+        '--watch', action='store_true',
+        help="Не завершаться: следить за папкой и обрабатывать новые и измененные файлы"
+    )
+    parser.add_argument(
+        '--poll-interval', type=float, default=1.0,
+        help="Интервал опроса папки в режиме --watch, секунд"
+    )
+    parser.add_argument(
+        '--settle', type=float, default=2.0,
+        help="Сколько секунд файл не должен меняться, чтобы считаться дописанным"
+    )
+    parser.add_argument(
+        '--metrics', nargs='?', const='', default=None, metavar='PATH',
+        help="Замерять время, строки и память по этапам и сохранить замеры в JSON/CSV "
+             "(по умолчанию metrics_<дата>.json в папке скрипта)"
+    )
+    parser.add_argument(
+        '--format', choices=sorted(OUTPUT_FORMATS), default='csv',
+        help="Формат результата: csv (по умолчанию), parquet или arrow"
+    )
+    parser.add_argument(
+        '--aggregate', action='store_true',
+        help=f"Построить сводный отчет {REPORT_FILENAME} по всем файлам папки "
+             "(все файлы обрабатываются заново)"
+    )
+    parser.add_argument(
+        '--engine', choices=ENGINES, default='auto',
+        help="Движок обработки: auto (lite для небольших файлов, иначе pandas), pandas или lite"
+    )
+    args = parser.parse_args()
+    if args.watch and args.aggregate:
+        parser.error("--aggregate не поддерживается в режиме --watch: сводный отчет строится по всей папке")
+    if args.engine == 'lite' and not lite_supported(**processing_options(args)):
+        parser.error("движок lite поддерживает только вывод в CSV без --chunksize и --aggregate")
+    return args
+
+def processing_options(args) -> dict:
+    """Параметры MusicFileProcessor.process_file из аргументов запуска"""
+    return {
+        'chunksize': args.chunksize,
+        'collect_metrics': args.metrics is not None,
+        'output_format': args.format,
+        'keep_aggregated': args.aggregate,
+    }
+
+def watch(folder: str, args, manifest: Manifest) -> None:
+    """
+    Режим наблюдения за папкой.
+    Модули и процессор загружаются один раз, обрабатываются только
+    новые или измененные файлы после окончания их записи. Замеры всех
+    обработанных за время наблюдения файлов пишутся в один файл.
+    """
+    engines = EngineSelector(args.engine)
+    started_at = datetime.now()
+    metrics_path = None
+    if args.metrics is not None:
+        metrics_path = args.metrics or default_metrics_path(folder)
+    watcher = FolderWatcher(folder, settle_seconds=args.settle,
+                            exclude=[metrics_path] if metrics_path else [])
+    processed = []
+    logger.info(f"Наблюдение за папкой {folder} (Ctrl+C для остановки)")
+    
+    try:
+        while True:
+            for input_path in watcher.poll():
+                output_path = output_path_for(input_path, args.format)
+                if not args.force and manifest.is_current(input_path, output_path):
+                    continue
+                
+                started = time.perf_counter()
+                result = engines.process_file(input_path, output_path, **processing_options(args))
+                if metrics_path is not None:
+                    # Для замеров агрегаты не нужны, иначе память растет все время наблюдения
+                    result.aggregated = None
+                    processed.append(result)
+                    write_metrics(processed, metrics_path, started_at)
+                if result.success:
+                    manifest.record(input_path, output_path)
+                    manifest.save()
+                    logger.info(f"Готово за {time.perf_counter() - started:.2f} с.")
+            time.sleep(args.poll_interval)
+    except KeyboardInterrupt:
+        logger.info("Наблюдение остановлено.")
+    finally:
+        manifest.save()
+
 def main():
     """
     Основная функция скрипта.
     Находит все CSV файлы в директории (кроме уже обработанных) и обрабатывает их.
     """
+    args = parse_args()
     try:
-        processor = MusicFileProcessor()
+        if args.format != 'csv':
+            if importlib.util.find_spec('pyarrow') is None:
+                logger.error(f"Для формата {args.format} нужен пакет pyarrow: pip install pyarrow")
+                return
         
-        # Получаем список файлов для обработки
         folder = os.path.dirname(os.path.abspath(__file__))
-        csv_files = [
-            f for f in glob.glob(os.path.join(folder, "*.csv"))
-            if not f.endswith("_edit.csv")
-        ]
+        manifest = Manifest(folder, config_fingerprint(output_format=args.format))
+        
+        if args.watch:
+            watch(folder, args, manifest)
+            return
+        
+        # Получаем список файлов для обработки (файл замеров входом не считается)
+        csv_files = list_input_files(folder, exclude=[args.metrics] if args.metrics else [])
         
         if not csv_files:
             logger.info("Нет файлов для обработки.")
             return
             
-        logger.info(f"Найдено файлов для обработки: {len(csv_files)}")
+        jobs = []
+        for input_path in csv_files:
+            output_path = output_path_for(input_path, args.format)
+            # Для сводного отчета нужны данные всех файлов
+            if args.force or args.aggregate or not manifest.is_current(input_path, output_path):
+                jobs.append((input_path, output_path))
+        
+        skipped = len(csv_files) - len(jobs)
+        logger.info(
+            f"Найдено файлов: {len(csv_files)}, к обработке: {len(jobs)}, "
+            f"без изменений: {skipped}"
+        )
+        if not jobs:
+            manifest.save()
+            return
+        
+        started_at = datetime.now()
+        started = time.perf_counter()
+        options = processing_options(args)
+        engines = EngineSelector(args.engine)
+        report = None
+        if args.aggregate:
+            from processor import MusicFileProcessor
+            from report import ConsolidatedReport
+            report = ConsolidatedReport(MusicFileProcessor())
+        
+        def collect(result):
+            # Таблица файла сразу сливается в отчет и дальше не хранится
+            if report is not None and result.aggregated is not None:
+                report.add(result.aggregated)
+                result.aggregated = None
         
         # Обрабатываем каждый файл
-        for input_path in csv_files:
-            base, ext = os.path.splitext(input_path)
-            output_path = f"{base}_edit{ext}"
-            processor.process_file(input_path, output_path)
-            
-        logger.info("Обработка всех файлов завершена.")
+        if args.workers > 1 and len(jobs) > 1:
+            results = process_files_parallel(
+                jobs, args.workers, on_result=collect, engine=args.engine, **options
+            )
+        else:
+            results = []
+            for input_path, output_path in jobs:
+                result = engines.process_file(input_path, output_path, **options)
+                collect(result)
+                results.append(result)
+        
+        if report is not None:
+            report.save(os.path.join(folder, REPORT_FILENAME))
+        
+        elapsed = time.perf_counter() - started
+        for result in results:
+            if result.success:
+                manifest.record(result.input_path, result.output_path)
+        manifest.save()
+        
+        if args.metrics is not None:
+            write_metrics(results, args.metrics or default_metrics_path(folder), started_at)
+        
+        failed = [r for r in results if not r.success]
+        for result in failed:
+            logger.error(f"Не обработан: {os.path.basename(result.input_path)} — {result.error}")
+        
+        logger.info(
+            f"Обработка всех файлов завершена: успешно {len(results) - len(failed)}, "
+            f"с ошибками {len(failed)}, время {elapsed:.2f} с."
+        )
             
     except Exception as e:
         logger.error(f"Критическая ошибка: {e}")
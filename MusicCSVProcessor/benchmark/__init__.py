@@ -0,0 +1,6 @@
+"""
+Бенчмарки MusicCSVProcessor на синтетических данных.
+
+Запуск из папки MusicCSVProcessor:
+    python -m benchmark.run --sizes 1000 100000 1000000
+"""
@@ -0,0 +1,99 @@
+"""
+Генератор синтетических входных CSV в формате config.INPUT_COLUMNS.
+
+Строки имитируют выгрузку ALE: имена файлов вида
+"<клип>_<библиотека>_<номер>_<название>_<исполнитель>.mp3", временные
+метки "HH:MM:SS:FF", повторы одних и тех же треков и попадания в
+config.EXCLUDED_TITLES.
+"""
+import csv
+import random
+from typing import List
+
+import config
+
+WORDS = [
+    'morning', 'light', 'city', 'drive', 'dark', 'river', 'dream', 'echo',
+    'storm', 'silver', 'blue', 'night', 'fire', 'road', 'ocean', 'glass',
+    'summer', 'shadow', 'heart', 'motion', 'wild', 'sky', 'gold', 'pulse',
+]
+LIBRARIES = ['bbcpm', 'apm', 'kpm', 'ext', 'uppm', 'wcpm', 'ed', 'koka']
+
+# Сколько строк генерировать за одну запись в файл
+WRITE_BATCH = 10000
+# Верхняя граница числа уникальных треков, чтобы генерация 10M строк умещалась в памяти
+MAX_UNIQUE_TRACKS = 500000
+
+
+def _words(rng: random.Random, count: int) -> str:
+    return '-'.join(rng.choice(WORDS) for _ in range(count))
+
+
+def make_track_pool(size: int, excluded_rate: float, rng: random.Random) -> List[str]:
+    """
+    Создает набор уникальных имен треков (без префикса клипа).
+
+    Args:
+        size: Количество уникальных треков
+        excluded_rate: Доля треков, название которых попадает в EXCLUDED_TITLES
+        rng: Генератор случайных чисел
+    """
+    excluded = list(config.EXCLUDED_TITLES)
+    pool = []
+    for n in range(size):
+        library = rng.choice(LIBRARIES)
+        title = _words(rng, rng.randint(1, 3))
+        if excluded and rng.random() < excluded_rate:
+            title = f"{title}-{excluded[n % len(excluded)]}"
+        artist = _words(rng, rng.randint(1, 2))
+        if rng.random() < 0.05:
+            # ID с '__' внутри - такие заголовки исправляет clean_data
+            pool.append(f"{library}_{n:06d}__{title}_{_words(rng, 1)}-mix_{artist}.mp3")
+        else:
+            pool.append(f"{library}_{n:06d}_{title}_{artist}.mp3")
+    return pool
+
+
+def _timestamp(rng: random.Random) -> str:
+    # Большинство фрагментов короткие, часть длиннее минуты
+    seconds = int(rng.expovariate(1 / 20.0))
+    frames = rng.randint(0, 24)
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}:{frames:02d}"
+
+
+def generate_input(path: str, rows: int, duplicate_rate: float = 0.7,
+                   excluded_rate: float = 0.05, series_count: int = 10,
+                   malformed_rate: float = 0.001, seed: int = 0) -> None:
+    """
+    Записывает синтетический входной CSV.
+
+    Args:
+        path: Путь к создаваемому файлу
+        rows: Количество строк
+        duplicate_rate: Доля строк, повторяющих уже встречавшийся трек
+        excluded_rate: Доля треков с исключаемыми словами в названии
+        series_count: Количество разных значений series_number
+        malformed_rate: Доля строк с испорченными временными метками и именами
+        seed: Начальное значение генератора
+    """
+    rng = random.Random(seed)
+    unique = min(MAX_UNIQUE_TRACKS, max(1, int(rows * (1 - duplicate_rate))))
+    pool = make_track_pool(unique, excluded_rate, rng)
+
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, delimiter=config.CSV_SEPARATOR)
+        batch = []
+        for _ in range(rows):
+            values = {
+                'original_string': f"A{rng.randint(1, 999):03d}_{rng.choice(pool)}",
+                'timestamp': _timestamp(rng),
+                'series_number': rng.randint(1, series_count),
+            }
+            if rng.random() < malformed_rate:
+                values['original_string'] = 'clip.mp3'
+                values['timestamp'] = '00:xx:10'
+            batch.append([values.get(col, '') for col in config.INPUT_COLUMNS])
+            if len(batch) >= WRITE_BATCH:
+                writer.writerows(batch)
+                batch.clear()
+        writer.writerows(batch)
@@ -0,0 +1,61 @@
+"""
+Сравнение скорости поиска исключаемых слов: простая альтернатива
+"слово1|слово2|..." против шаблона-дерева из matcher.
+
+Запуск из папки MusicCSVProcessor:
+    python -m benchmark.matcher_bench --sizes 10 100 1000 5000
+"""
+import re
+import time
+import random
+import argparse
+from typing import List
+
+from matcher import build_keyword_pattern
+from benchmark.generator import WORDS
+
+SUFFIXES = ['', 's', 'er', 'ing', 'ed', 'mix', 'edit', 'version', 'loop', 'cut']
+
+
+def make_keywords(count: int, rng: random.Random) -> List[str]:
+    """Слова с общими префиксами, как в реальных списках исключений"""
+    keywords = set()
+    while len(keywords) < count:
+        stem = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(3, 6)))
+        keywords.add(stem + rng.choice(SUFFIXES))
+    return sorted(keywords)
+
+
+def make_titles(count: int, rng: random.Random) -> List[str]:
+    return [' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))).title() for _ in range(count)]
+
+
+def scan_seconds(regex: re.Pattern, titles: List[str]) -> float:
+    started = time.perf_counter()
+    for title in titles:
+        regex.search(title)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк поиска исключаемых слов")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 5000],
+                        help="Количество слов в списке исключений")
+    parser.add_argument('--titles', type=int, default=20000, help="Количество проверяемых названий")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    titles = make_titles(args.titles, rng)
+    print(f"{'слов':>8} {'альтернатива, с':>16} {'дерево, с':>10} {'ускорение':>10}")
+    for size in args.sizes:
+        keywords = make_keywords(size, rng)
+        naive = re.compile('|'.join(re.escape(k) for k in keywords), re.IGNORECASE)
+        trie = re.compile(build_keyword_pattern(keywords), re.IGNORECASE)
+        naive_time = scan_seconds(naive, titles)
+        trie_time = scan_seconds(trie, titles)
+        print(f"{size:>8} {naive_time:>16.3f} {trie_time:>10.3f} {naive_time / trie_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
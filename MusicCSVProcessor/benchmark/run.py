@@ -0,0 +1,157 @@
+"""
+Замер производительности MusicFileProcessor на синтетических данных.
+
+Запуск из папки MusicCSVProcessor:
+    python -m benchmark.run --sizes 1000 100000 1000000 --repeat 3
+    python -m benchmark.run --compare benchmark/results/old.json benchmark/results/new.json
+"""
+import os
+import json
+import time
+import logging
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from processor import MusicFileProcessor
+from benchmark.generator import generate_input
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BENCH_DIR, 'data')
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+
+
+def input_for(rows: int, seed: int) -> str:
+    """Возвращает путь к синтетическому входу, создавая его при необходимости"""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = os.path.join(DATA_DIR, f"synthetic_{rows}_{seed}.csv")
+    if not os.path.exists(path):
+        print(f"Генерация {rows} строк → {path}")
+        generate_input(path, rows, seed=seed)
+    return path
+
+
+def bench_size(processor: MusicFileProcessor, rows: int, repeat: int, seed: int,
+               chunksize: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Замеряет обработку одного синтетического файла.
+
+    Для каждого этапа и для конвейера целиком берется лучшее время из repeat запусков.
+    """
+    input_path = input_for(rows, seed)
+    totals = []
+    stages: Dict[str, Dict[str, float]] = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_path = os.path.join(tmp, 'output.csv')
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = processor.process_file(
+                input_path, output_path, chunksize=chunksize, collect_metrics=True
+            )
+            totals.append(time.perf_counter() - started)
+            if not result.success:
+                raise RuntimeError(f"Ошибка обработки {input_path}: {result.error}")
+
+            for s in result.stages:
+                best = stages.setdefault(s.stage, {'seconds': s.seconds, 'memory_bytes': s.memory_bytes})
+                best['seconds'] = min(best['seconds'], s.seconds)
+                best['memory_bytes'] = max(best['memory_bytes'], s.memory_bytes)
+
+    total = min(totals)
+    return {
+        'rows': rows,
+        'rows_out': result.rows_out,
+        'total_seconds': total,
+        'rows_per_second': rows / total if total else None,
+        'stages': stages,
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=BENCH_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes: List[int], repeat: int, seed: int, chunksize: Optional[int],
+        output_path: Optional[str]) -> str:
+    """Выполняет замеры для всех размеров и сохраняет результаты в JSON"""
+    processor = MusicFileProcessor()
+    results = []
+    for rows in sizes:
+        entry = bench_size(processor, rows, repeat, seed, chunksize)
+        results.append(entry)
+        print(f"{rows:>10} строк: {entry['total_seconds']:.3f} с "
+              f"({entry['rows_per_second']:.0f} строк/с)")
+        for stage, values in entry['stages'].items():
+            print(f"{'':>12}{stage:<20} {values['seconds']:.3f} с")
+
+    report = {
+        'date': datetime.now().isoformat(),
+        'revision': _git_revision(),
+        'python': platform.python_version(),
+        'host': platform.node(),
+        'repeat': repeat,
+        'seed': seed,
+        'chunksize': chunksize,
+        'results': results,
+    }
+    if output_path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output_path = os.path.join(RESULTS_DIR, f"bench_{datetime.now():%Y%m%d_%H%M%S}.json")
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Результаты сохранены в {output_path}")
+    return output_path
+
+
+def compare(old_path: str, new_path: str) -> None:
+    """Печатает отношение времени нового запуска к старому по размерам и этапам"""
+    with open(old_path, 'r', encoding='utf-8') as f:
+        old = {r['rows']: r for r in json.load(f)['results']}
+    with open(new_path, 'r', encoding='utf-8') as f:
+        new = {r['rows']: r for r in json.load(f)['results']}
+
+    for rows in sorted(set(old) & set(new)):
+        o, n = old[rows], new[rows]
+        print(f"{rows:>10} строк: {o['total_seconds']:.3f} → {n['total_seconds']:.3f} с "
+              f"(x{n['total_seconds'] / o['total_seconds']:.2f})")
+        for stage in n['stages']:
+            if stage in o['stages'] and o['stages'][stage]['seconds']:
+                before = o['stages'][stage]['seconds']
+                after = n['stages'][stage]['seconds']
+                print(f"{'':>12}{stage:<20} {before:.3f} → {after:.3f} с (x{after / before:.2f})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк MusicFileProcessor")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="Количество строк во входных файлах (от 1000 до 10000000)")
+    parser.add_argument('--repeat', type=int, default=3, help="Количество повторов каждого замера")
+    parser.add_argument('--seed', type=int, default=0, help="Начальное значение генератора данных")
+    parser.add_argument('--chunksize', type=int, default=None, help="Замерять потоковый режим")
+    parser.add_argument('--output', default=None, help="Путь к JSON с результатами")
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'),
+                        help="Сравнить два сохраненных результата")
+    args = parser.parse_args()
+
+    # Логи процессора по каждому файлу здесь только мешают
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.compare:
+        compare(*args.compare)
+    else:
+        run(args.sizes, args.repeat, args.seed, args.chunksize, args.output)
+
+
+if __name__ == "__main__":
+    main()
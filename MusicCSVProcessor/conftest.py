@@ -0,0 +1,23 @@
+"""
+Общие настройки тестов MusicCSVProcessor.
+
+Запуск из папки MusicCSVProcessor:
+    python -m pytest
+"""
+import sys
+import types
+
+# Если config.py не заполнен, тесты используют собственные настройки
+try:
+    import config
+except ImportError:
+    config = types.ModuleType('config')
+    config.CSV_SEPARATOR = ';'
+    config.CSV_ENCODING = 'utf-8-sig'
+    config.INPUT_COLUMNS = ['original_string', 'source', 'timestamp', 'series_number']
+    config.OUTPUT_COLUMNS = ['ID', 'library_code', 'Title', 'Artist', 'duration_seconds',
+                             'series_number', 'repeat_count', 'Concatenated', '']
+    config.EXCLUDED_TITLES = ['intro', 'sting']
+    config.ARTIST_CLEANUP_PATTERN = r'(?i)\b(feat|ft)\b.*'
+    config.MINIMUM_DURATION = 5
+    sys.modules['config'] = config
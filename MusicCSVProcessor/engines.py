@@ -0,0 +1,80 @@
+"""
+Выбор движка обработки: pandas (MusicFileProcessor) или облегченный (LiteFileProcessor).
+
+pandas импортируется только при первом файле, которому нужен полный движок.
+"""
+import logging
+
+import config
+from models import ProcessResult
+from lite import LiteFileProcessor
+
+# Файлы не длиннее этого числа строк обрабатываются без pandas
+DEFAULT_LITE_MAX_ROWS = 20000
+ENGINES = ('auto', 'pandas', 'lite')
+COUNT_BLOCK_SIZE = 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+def lite_max_rows() -> int:
+    """Порог числа строк из config.py или значение по умолчанию"""
+    return getattr(config, 'LITE_ENGINE_MAX_ROWS', DEFAULT_LITE_MAX_ROWS)
+
+
+def count_rows(path: str, limit: int) -> int:
+    """Считает строки файла, останавливаясь, как только их больше limit"""
+    count = 0
+    last = b'\n'
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(COUNT_BLOCK_SIZE), b''):
+            count += block.count(b'\n')
+            last = block[-1:]
+            if count > limit:
+                return count
+    # Последняя строка без перевода строки
+    return count + (last != b'\n')
+
+
+def lite_supported(chunksize=None, output_format: str = 'csv',
+                   keep_aggregated: bool = False, **options) -> bool:
+    """Проверяет, что параметры обработки доступны облегченному движку"""
+    return not chunksize and output_format == 'csv' and not keep_aggregated
+
+
+class EngineSelector:
+    """Обрабатывает файлы выбранным движком; в режиме auto выбор делается по размеру файла"""
+
+    def __init__(self, engine: str = 'auto'):
+        if engine not in ENGINES:
+            raise ValueError(f"Неизвестный движок: {engine}")
+        self.engine = engine
+        self._lite = None
+        self._pandas = None
+
+    def choose(self, input_path: str, **options) -> str:
+        """Возвращает 'lite' или 'pandas' для файла"""
+        if self.engine != 'auto':
+            return self.engine
+        if not lite_supported(**options):
+            return 'pandas'
+        try:
+            limit = lite_max_rows()
+            return 'lite' if count_rows(input_path, limit) <= limit else 'pandas'
+        except OSError:
+            # Ошибку чтения сообщит сам процессор
+            return 'pandas'
+
+    def process_file(self, input_path: str, output_path: str, **options) -> ProcessResult:
+        """Обрабатывает файл подходящим движком (см. MusicFileProcessor.process_file)"""
+        if self.choose(input_path, **options) == 'lite':
+            if self._lite is None:
+                self._lite = LiteFileProcessor()
+            return self._lite.process_file(
+                input_path, output_path, collect_metrics=options.get('collect_metrics', False)
+            )
+
+        if self._pandas is None:
+            from processor import MusicFileProcessor
+            self._pandas = MusicFileProcessor()
+        return self._pandas.process_file(input_path, output_path, **options)
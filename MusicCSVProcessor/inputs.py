@@ -0,0 +1,37 @@
+"""
+Входные и выходные файлы в папке процессора
+"""
+import os
+import glob
+from typing import Iterable, List
+
+# Результаты обработки, сводный отчет и замеры лежат в той же папке, но входами не являются
+OUTPUT_SUFFIX = '_edit.csv'
+REPORT_FILENAME = 'consolidated_report.csv'
+METRICS_PREFIX = 'metrics_'
+
+# Поддерживаемые форматы вывода и расширения файлов результата
+OUTPUT_FORMATS = {'csv': '.csv', 'parquet': '.parquet', 'arrow': '.arrow'}
+
+
+def is_input_file(path: str, exclude: Iterable[str] = ()) -> bool:
+    """
+    Проверяет, что CSV файл является входным, а не результатом обработки.
+    exclude - дополнительные пути, которые входами не считаются (например, файл замеров).
+    """
+    name = os.path.basename(path)
+    if path.endswith(OUTPUT_SUFFIX) or name == REPORT_FILENAME or name.startswith(METRICS_PREFIX):
+        return False
+    return os.path.abspath(path) not in {os.path.abspath(p) for p in exclude}
+
+
+def list_input_files(folder: str, exclude: Iterable[str] = ()) -> List[str]:
+    """Возвращает входные CSV файлы папки в алфавитном порядке"""
+    exclude = list(exclude)
+    return sorted(f for f in glob.glob(os.path.join(folder, "*.csv")) if is_input_file(f, exclude))
+
+
+def output_path_for(input_path: str, output_format: str = 'csv') -> str:
+    """Возвращает путь к результату обработки входного файла"""
+    base, _ = os.path.splitext(input_path)
+    return f"{base}_edit{OUTPUT_FORMATS[output_format]}"
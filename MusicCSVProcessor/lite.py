@@ -0,0 +1,219 @@
+"""
+Облегченный движок обработки на модуле csv, без pandas.
+
+Повторяет семантику MusicFileProcessor: разбор имен файлов, очистку,
+объединение повторов, фильтрацию и форматирование, и записывает такой же
+CSV. Используется для небольших файлов, где импорт pandas занимает
+большую часть времени работы скрипта.
+"""
+import os
+import re
+import csv
+import time
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+import config
+from models import TrackInfo, ProcessResult, StageMetrics
+from metrics import add_stage, log_stages
+from timecode import timecode_value_to_seconds, default_frame_rate, NUMBER_PATTERN
+from matcher import excluded_titles_regex, artist_cleanup_regex
+
+# Значения, которые pandas.read_csv по умолчанию считает пропусками
+NA_VALUES = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+    '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None',
+    'n/a', 'nan', 'null',
+])
+INT_PATTERN = re.compile(r'[ \t\n\r\v\f]*[+-]?[0-9]+[ \t\n\r\v\f]*')
+
+# Строка входа: (original_string, timestamp, series_number)
+Row = List[Optional[object]]
+
+
+def _na(value: str) -> Optional[str]:
+    return None if value in NA_VALUES else value
+
+
+def _infer_numbers(values: List[Optional[str]]) -> list:
+    """
+    Приводит колонку к числам так же, как pandas.read_csv: целые, если все
+    значения целые и пропусков нет; float, если есть пропуски или дробные;
+    иначе колонка остается строковой.
+    """
+    present = [v for v in values if v is not None]
+    if present and all(INT_PATTERN.fullmatch(v) for v in present):
+        if len(present) == len(values):
+            return [int(v) for v in values]
+        return [None if v is None else float(v) for v in values]
+    if all(NUMBER_PATTERN.fullmatch(v) for v in present):
+        return [None if v is None else float(v) for v in values]
+    return values
+
+
+def parse_filename(filename: Optional[str]) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """То же, что MusicFileProcessor.parse_filename: (item_id, title, artist)"""
+    if not isinstance(filename, str):
+        return None, None, None
+    parts = filename.split('.mp3')[0].split('_')
+    if len(parts) >= 4:
+        artist = parts[-1].replace('-', ' ').title()
+        title = parts[-2].replace('-', ' ').title()
+        return '_'.join(parts[1:-2]), title, artist
+    return None, None, None
+
+
+class LiteFileProcessor:
+    """Процессор без pandas для небольших файлов (только вывод в CSV)"""
+
+    def __init__(self, frame_rate: Optional[float] = None):
+        self.logger = logging.getLogger(__name__)
+        self.frame_rate = frame_rate if frame_rate is not None else default_frame_rate()
+        self._columns = [
+            config.INPUT_COLUMNS.index(col)
+            for col in ('original_string', 'timestamp', 'series_number')
+        ]
+
+    def read_input(self, input_path: str) -> List[Row]:
+        """Читает входной CSV файл"""
+        rows = []
+        with open(input_path, 'r', encoding='utf-8', newline='') as f:
+            for fields in csv.reader(f, delimiter=config.CSV_SEPARATOR):
+                if not fields:
+                    continue  # pandas пропускает пустые строки
+                rows.append([_na(fields[i]) if i < len(fields) else None for i in self._columns])
+
+        series = _infer_numbers([row[2] for row in rows])
+        for row, value in zip(rows, series):
+            row[2] = value
+        return rows
+
+    def parse_tracks(self, rows: List[Row]) -> List[TrackInfo]:
+        """Извлекает информацию о треках из имен файлов"""
+        tracks = []
+        for original, _, series_number in rows:
+            item_id, title, artist = parse_filename(original)
+            tracks.append(TrackInfo(item_id, title, artist, 0, series_number))
+        return tracks
+
+    def clean_data(self, tracks: List[TrackInfo], rows: List[Row]) -> List[TrackInfo]:
+        """Очищает и форматирует данные"""
+        cleanup_regex = artist_cleanup_regex()
+        artists: Dict[str, str] = {}
+
+        for track, row in zip(tracks, rows):
+            # Исправление заголовков
+            if track.id is not None and '__' in track.id:
+                track.id, title = track.id.split('__', 1)
+                track.title = title.replace('-', ' ').title()
+
+            # Очистка имен исполнителей
+            if track.artist is not None:
+                cleaned = artists.get(track.artist)
+                if cleaned is None:
+                    cleaned = artists[track.artist] = cleanup_regex.sub('', track.artist).strip()
+                track.artist = cleaned
+
+            # round, как и numpy, округляет половины до четного
+            track.duration = round(timecode_value_to_seconds(row[1], self.frame_rate))
+
+            if track.id is not None:
+                track.library_code = track.id.split('_')[0].upper()
+                track.id = track.id.upper()
+        return tracks
+
+    def process_duplicates(self, tracks: List[TrackInfo]) -> List[TrackInfo]:
+        """Объединяет повторы треков; строки с пропусками в ключе отбрасываются"""
+        groups: Dict[tuple, TrackInfo] = {}
+        for t in tracks:
+            key = (t.id, t.library_code, t.title, t.artist, t.series_number)
+            if any(part is None for part in key):
+                continue
+            group = groups.get(key)
+            if group is None:
+                groups[key] = TrackInfo(t.id, t.title, t.artist, t.duration,
+                                        t.series_number, t.library_code, 1)
+            else:
+                group.duration += t.duration
+                group.repeat_count += 1
+        return [groups[key] for key in sorted(groups)]
+
+    def filter_tracks(self, tracks: List[TrackInfo]) -> List[TrackInfo]:
+        """Фильтрует треки по длительности и названию"""
+        title_regex = excluded_titles_regex()
+        return [
+            t for t in tracks
+            if t.duration >= config.MINIMUM_DURATION and not title_regex.search(t.title)
+        ]
+
+    def format_output(self, tracks: List[TrackInfo]) -> List[list]:
+        """Форматирует данные для вывода в порядке config.OUTPUT_COLUMNS"""
+        output = []
+        for t in tracks:
+            values = {
+                'ID': t.id,
+                'library_code': t.library_code,
+                'Title': t.title,
+                'Artist': t.artist,
+                'duration_seconds': f"{t.duration} сек",
+                'series_number': t.series_number,
+                'repeat_count': t.repeat_count,
+                'Concatenated': t.get_concatenated(),
+                '': '',
+            }
+            output.append([values[col] for col in config.OUTPUT_COLUMNS])
+        return output
+
+    def save_output(self, rows: List[list], output_path: str) -> None:
+        """Сохраняет результат в CSV файл так же, как DataFrame.to_csv"""
+        with open(output_path, 'w', encoding=config.CSV_ENCODING, newline='') as f:
+            writer = csv.writer(f, delimiter=config.CSV_SEPARATOR, lineterminator=os.linesep)
+            writer.writerow(config.OUTPUT_COLUMNS)
+            writer.writerows(rows)
+
+    def _stage(self, stages: Optional[List[StageMetrics]], func: Callable, data, *args):
+        """Выполняет этап, при необходимости замеряя время и строки"""
+        if stages is None:
+            return func(data, *args)
+        started = time.perf_counter()
+        output = func(data, *args)
+        rows_out = len(output) if output is not None else len(data)
+        add_stage(stages, func.__name__, time.perf_counter() - started,
+                  len(data) if isinstance(data, list) else 0, rows_out, 0)
+        return output
+
+    def process_file(self, input_path: str, output_path: str,
+                     collect_metrics: bool = False) -> ProcessResult:
+        """Обрабатывает один файл (аналог MusicFileProcessor.process_file)"""
+        result = ProcessResult(input_path, output_path, success=False)
+        stages = result.stages if collect_metrics else None
+        try:
+            self.logger.info(f"Начало обработки файла: {input_path}")
+
+            rows = self._stage(stages, self.read_input, input_path)
+            tracks = self._stage(stages, self.parse_tracks, rows)
+            tracks = self._stage(stages, self.clean_data, tracks, rows)
+            tracks = self._stage(stages, self.process_duplicates, tracks)
+            tracks = self._stage(stages, self.filter_tracks, tracks)
+            output = self._stage(stages, self.format_output, tracks)
+            self._stage(stages, self.save_output, output, output_path)
+
+            result.rows_in = len(rows)
+            result.rows_out = len(output)
+            result.success = True
+
+            self.logger.info(
+                f"Обработан: {os.path.basename(input_path)} → {os.path.basename(output_path)} | "
+                f"Удалено {len(rows) - len(output)} треков по фильтру."
+            )
+            if collect_metrics:
+                log_stages(result)
+
+        except FileNotFoundError:
+            self.logger.error(f"Ошибка: файл не найден {input_path}")
+            result.error = "файл не найден"
+        except Exception as e:
+            self.logger.error(f"Ошибка при обработке {input_path}: {e}")
+            result.error = str(e)
+
+        return result
@@ -0,0 +1,120 @@
+"""
+Манифест обработанных файлов.
+
+Хранит для каждого входного CSV размер, время изменения и хэш содержимого,
+а также хэш настроек config, с которыми он был обработан. Файл
+обрабатывается повторно только если изменился он сам или настройки.
+"""
+import os
+import json
+import hashlib
+import logging
+from typing import Dict, Any
+
+import config
+
+MANIFEST_FILENAME = '.ale2csv_manifest.json'
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def config_fingerprint(**options) -> str:
+    """
+    Возвращает хэш настроек, влияющих на результат обработки.
+
+    Args:
+        **options: Дополнительные параметры запуска, меняющие результат
+    """
+    relevant = {
+        'MINIMUM_DURATION': config.MINIMUM_DURATION,
+        'EXCLUDED_TITLES': list(config.EXCLUDED_TITLES),
+        'ARTIST_CLEANUP_PATTERN': config.ARTIST_CLEANUP_PATTERN,
+        'INPUT_COLUMNS': list(config.INPUT_COLUMNS),
+        'OUTPUT_COLUMNS': list(config.OUTPUT_COLUMNS),
+        'CSV_SEPARATOR': config.CSV_SEPARATOR,
+        'CSV_ENCODING': config.CSV_ENCODING,
+        'TIMECODE_FRAME_RATE': getattr(config, 'TIMECODE_FRAME_RATE', None),
+        'options': options,
+    }
+    payload = json.dumps(relevant, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def file_digest(path: str) -> str:
+    """Считает SHA-256 содержимого файла"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class Manifest:
+    """Манифест обработанных входных файлов одной папки"""
+
+    def __init__(self, folder: str, fingerprint: str):
+        self.path = os.path.join(folder, MANIFEST_FILENAME)
+        self.fingerprint = fingerprint
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.logger = logging.getLogger(__name__)
+        self._dirty = False
+        self.load()
+
+    def load(self) -> None:
+        """Загружает манифест; записи с другими настройками отбрасываются"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Не удалось прочитать манифест {self.path}: {e}")
+            return
+
+        if data.get('config_hash') != self.fingerprint:
+            self.logger.info("Настройки изменились с прошлого запуска, все файлы будут обработаны заново.")
+            self._dirty = True
+            return
+        self.entries = data.get('files', {})
+
+    def is_current(self, input_path: str, output_path: str) -> bool:
+        """Проверяет, что файл уже обработан с текущими настройками и не менялся"""
+        entry = self.entries.get(os.path.basename(input_path))
+        if not entry or not os.path.exists(output_path):
+            return False
+
+        stat = os.stat(input_path)
+        if stat.st_size != entry.get('size'):
+            return False
+        if stat.st_mtime_ns == entry.get('mtime_ns'):
+            return True
+
+        # Время изменения другое при том же размере: решает хэш содержимого
+        if file_digest(input_path) != entry.get('sha256'):
+            return False
+        entry['mtime_ns'] = stat.st_mtime_ns
+        self._dirty = True
+        return True
+
+    def record(self, input_path: str, output_path: str) -> None:
+        """Запоминает успешно обработанный файл"""
+        stat = os.stat(input_path)
+        self.entries[os.path.basename(input_path)] = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': file_digest(input_path),
+            'output': os.path.basename(output_path),
+        }
+        self._dirty = True
+
+    def save(self) -> None:
+        """Атомарно сохраняет манифест, если он изменился"""
+        if not self._dirty:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(
+                {'config_hash': self.fingerprint, 'files': self.entries},
+                f, ensure_ascii=False, indent=2
+            )
+        os.replace(tmp_path, self.path)
+        self._dirty = False
@@ -0,0 +1,85 @@
+"""
+Предкомпилированные шаблоны для фильтрации названий и очистки имен исполнителей.
+
+Список исключаемых слов собирается в одно регулярное выражение в виде
+префиксного дерева: общие префиксы слов проверяются один раз, поэтому
+время поиска растет медленно с ростом списка. Все шаблоны компилируются
+один раз на процесс.
+"""
+import re
+from functools import lru_cache
+from typing import Iterable, Optional, Pattern, Tuple
+
+import config
+
+# Шаблон, который ничего не находит (для пустого списка слов)
+NEVER_MATCH = r'(?!)'
+
+
+def _build_trie(keywords: Iterable[str]) -> dict:
+    trie: dict = {}
+    for word in keywords:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+    return trie
+
+
+def _trie_to_regex(node: dict) -> Optional[str]:
+    """Превращает поддерево в регулярное выражение; None для листа"""
+    branches = []
+    single_chars = []
+    for char in sorted(key for key in node if key):
+        sub = _trie_to_regex(node[char])
+        if sub is None:
+            single_chars.append(re.escape(char))
+        else:
+            branches.append(re.escape(char) + sub)
+
+    if not branches and not single_chars:
+        return None
+    if single_chars:
+        branches.append(single_chars[0] if len(single_chars) == 1 else f"[{''.join(single_chars)}]")
+
+    pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+    if '' in node:
+        # Слово может закончиться в этом узле
+        pattern = f"(?:{pattern})?"
+    return pattern
+
+
+def build_keyword_pattern(keywords: Iterable[str], ignore_case: bool = True) -> str:
+    """
+    Строит регулярное выражение, находящее любое из слов.
+
+    Спецсимволы регулярных выражений в словах экранируются, пустые слова
+    пропускаются.
+    """
+    words = {w.lower() if ignore_case else w for w in keywords if w}
+    if not words:
+        return NEVER_MATCH
+    return _trie_to_regex(_build_trie(words))
+
+
+@lru_cache(maxsize=None)
+def compile_keywords(keywords: Tuple[str, ...], ignore_case: bool = True) -> Pattern:
+    """Компилирует (с кэшированием) шаблон для набора слов"""
+    flags = re.IGNORECASE if ignore_case else 0
+    return re.compile(build_keyword_pattern(keywords, ignore_case), flags)
+
+
+@lru_cache(maxsize=None)
+def compile_pattern(pattern: str) -> Pattern:
+    """Компилирует (с кэшированием) произвольное регулярное выражение"""
+    return re.compile(pattern)
+
+
+def excluded_titles_regex() -> Pattern:
+    """Шаблон исключаемых названий из config.EXCLUDED_TITLES (без учета регистра)"""
+    return compile_keywords(tuple(config.EXCLUDED_TITLES))
+
+
+def artist_cleanup_regex() -> Pattern:
+    """Шаблон очистки имен исполнителей из config.ARTIST_CLEANUP_PATTERN"""
+    return compile_pattern(config.ARTIST_CLEANUP_PATTERN)
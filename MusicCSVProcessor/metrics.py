@@ -0,0 +1,94 @@
+"""
+Сбор и сохранение замеров этапов конвейера обработки
+"""
+import os
+import csv
+import json
+import logging
+import platform
+from datetime import datetime
+from typing import List, Optional
+
+from models import StageMetrics, ProcessResult
+from inputs import METRICS_PREFIX
+
+logger = logging.getLogger(__name__)
+
+CSV_FIELDS = ['input', 'success', 'stage', 'seconds', 'rows_in', 'rows_out', 'memory_bytes']
+
+
+def add_stage(stages: List[StageMetrics], stage: str, seconds: float,
+              rows_in: int, rows_out: int, memory_bytes: int) -> None:
+    """
+    Добавляет замер этапа. Повторные замеры одного этапа (например, по частям
+    файла в потоковом режиме) суммируются, для памяти берется максимум.
+    """
+    for existing in stages:
+        if existing.stage == stage:
+            existing.seconds += seconds
+            existing.rows_in += rows_in
+            existing.rows_out += rows_out
+            existing.memory_bytes = max(existing.memory_bytes, memory_bytes)
+            return
+    stages.append(StageMetrics(stage, seconds, rows_in, rows_out, memory_bytes))
+
+
+def log_stages(result: ProcessResult) -> None:
+    """Выводит замеры этапов файла в лог"""
+    for s in result.stages:
+        logger.info(
+            f"  {s.stage}: {s.seconds:.3f} с, строк {s.rows_in} → {s.rows_out}, "
+            f"память {s.memory_bytes / 1024 / 1024:.1f} МБ"
+        )
+
+
+def default_metrics_path(folder: str) -> str:
+    """Путь к файлу замеров для текущего запуска"""
+    return os.path.join(folder, f"{METRICS_PREFIX}{datetime.now():%Y%m%d_%H%M%S}.json")
+
+
+def write_metrics(results: List[ProcessResult], path: str,
+                  started_at: Optional[datetime] = None) -> None:
+    """
+    Сохраняет замеры запуска в JSON или CSV (по расширению файла).
+
+    Args:
+        results: Результаты обработки файлов
+        path: Путь к файлу замеров
+        started_at: Время начала запуска
+    """
+    if path.lower().endswith('.csv'):
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            for result in results:
+                for s in result.stages:
+                    writer.writerow({
+                        'input': os.path.basename(result.input_path),
+                        'success': result.success,
+                        'stage': s.stage,
+                        'seconds': f"{s.seconds:.6f}",
+                        'rows_in': s.rows_in,
+                        'rows_out': s.rows_out,
+                        'memory_bytes': s.memory_bytes,
+                    })
+    else:
+        output = {
+            'started_at': (started_at or datetime.now()).isoformat(),
+            'python': platform.python_version(),
+            'host': platform.node(),
+            'files': [
+                {
+                    'input': os.path.basename(result.input_path),
+                    'success': result.success,
+                    'rows_in': result.rows_in,
+                    'rows_out': result.rows_out,
+                    'seconds': sum(s.seconds for s in result.stages),
+                    'stages': [vars(s) for s in result.stages],
+                }
+                for result in results
+            ],
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(output, f, ensure_ascii=False, indent=2)
+    logger.info(f"Замеры сохранены в {path}")
@@ -1,12 +1,12 @@
 """
 Определение типов данных для обработки музыкальных файлов
 """
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Optional, List, Any
 
-@dataclass
+@dataclass(slots=True)
 class TrackInfo:
-    """Информация о музыкальном треке"""
+    """Информация о музыкальном треке (компактная запись облегченного движка)"""
     id: str
     title: str
     artist: str
@@ -18,3 +18,27 @@ class TrackInfo:
     def get_concatenated(self) -> str:
         """Возвращает конкатенированную строку с информацией о треке"""
         return f"{self.id}__{self.title}__{self.artist}"
+
+
+@dataclass
+class StageMetrics:
+    """Замеры одного этапа конвейера обработки"""
+    stage: str
+    seconds: float = 0.0
+    rows_in: int = 0
+    rows_out: int = 0
+    memory_bytes: int = 0
+
+
+@dataclass
+class ProcessResult:
+    """Результат обработки одного файла"""
+    input_path: str
+    output_path: str
+    success: bool
+    rows_in: int = 0
+    rows_out: int = 0
+    error: Optional[str] = None
+    stages: List[StageMetrics] = field(default_factory=list)
+    # Таблица после process_duplicates (pd.DataFrame), если ее запросили
+    aggregated: Any = None
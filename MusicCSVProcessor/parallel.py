@@ -0,0 +1,119 @@
+"""
+Параллельная обработка нескольких файлов в пуле процессов.
+
+Логи рабочих процессов не пишутся напрямую в processing.log: каждая задача
+собирает свои записи и возвращает их основному процессу, который выводит
+их целиком и в порядке входных файлов.
+"""
+import os
+import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple, Dict, Any, Callable, Optional
+
+from models import ProcessResult
+from engines import EngineSelector
+
+logger = logging.getLogger(__name__)
+
+# Процессоры создаются один раз на рабочий процесс
+_engines = None
+
+
+class _RecordBuffer(logging.Handler):
+    """Накапливает записи лога рабочего процесса"""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # Приводим запись к виду, который гарантированно передается через pickle
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        self.records.append(record)
+
+
+def _init_worker() -> None:
+    """Отключает унаследованные обработчики лога в рабочем процессе"""
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    root.setLevel(logging.INFO)
+
+
+def _process_job(input_path: str, output_path: str, engine: str,
+                 options: Dict[str, Any]) -> Tuple[ProcessResult, List[logging.LogRecord]]:
+    """Обрабатывает один файл в рабочем процессе"""
+    global _engines
+    if _engines is None:
+        _engines = EngineSelector(engine)
+
+    buffer = _RecordBuffer()
+    root = logging.getLogger()
+    root.addHandler(buffer)
+    try:
+        result = _engines.process_file(input_path, output_path, **options)
+    except Exception as e:
+        # process_file перехватывает ошибки обработки сам, сюда попадают только непредвиденные
+        result = ProcessResult(input_path, output_path, success=False, error=str(e))
+    finally:
+        root.removeHandler(buffer)
+    return result, buffer.records
+
+
+def process_files_parallel(jobs: List[Tuple[str, str]], workers: int,
+                           on_result: Optional[Callable[[ProcessResult], None]] = None,
+                           engine: str = 'auto', **options) -> List[ProcessResult]:
+    """
+    Обрабатывает файлы в пуле из workers процессов.
+
+    Одновременно в работе не больше 2 * workers файлов, поэтому готовые
+    результаты не накапливаются, даже если ранний файл обрабатывается долго.
+
+    Args:
+        jobs: Список пар (входной файл, выходной файл)
+        workers: Количество рабочих процессов
+        on_result: Вызывается в основном процессе для каждого результата
+            в порядке jobs
+        engine: Движок обработки: 'auto', 'pandas' или 'lite'
+        **options: Параметры MusicFileProcessor.process_file
+
+    Returns:
+        list: ProcessResult для каждого файла в порядке jobs
+    """
+    results = []
+    window = 2 * workers
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        pending = deque()
+        queued = iter(jobs)
+
+        for n in range(1, len(jobs) + 1):
+            while len(pending) < window:
+                job = next(queued, None)
+                if job is None:
+                    break
+                pending.append((pool.submit(_process_job, job[0], job[1], engine, options), job))
+
+            future, (input_path, output_path) = pending.popleft()
+            try:
+                result, records = future.result()
+            except Exception as e:
+                # Например, аварийное завершение рабочего процесса
+                result = ProcessResult(input_path, output_path, success=False, error=str(e))
+                records = []
+
+            for record in records:
+                logging.getLogger(record.name).handle(record)
+
+            status = "готово" if result.success else f"ошибка: {result.error}"
+            logger.info(f"[{n}/{len(jobs)}] {os.path.basename(input_path)} — {status}")
+            if on_result is not None:
+                on_result(result)
+            results.append(result)
+
+    return results
@@ -2,18 +2,77 @@
 Основной модуль обработки музыкальных файлов
 """
 import logging
-from typing import List, Dict, Any
+import time
+from typing import List, Dict, Any, Iterator, Optional, Tuple, Callable
+import numpy as np
 import pandas as pd
 import os
 
 import config
-from models import TrackInfo
+from models import TrackInfo, ProcessResult, StageMetrics
+from metrics import add_stage, log_stages
+from timecode import timecode_to_seconds, default_frame_rate
+from matcher import excluded_titles_regex, artist_cleanup_regex
+
+# "*_ID_НАЗВАНИЕ_ИСПОЛНИТЕЛЬ": префикс до первого '_', ID (может содержать '_'),
+# название и исполнитель - последние две части. Эквивалентно условию
+# len(parts) >= 4 в parse_filename.
+FILENAME_PATTERN = r'(?s)\A[^_]*_(?P<ID>.*)_(?P<Title>[^_]*)_(?P<Artist>[^_]*)\Z'
+
+# Колонки, по которым трек считается уникальным
+UNIQUE_TRACK_COLS = ['ID', 'library_code', 'Title', 'Artist', 'series_number']
+
+
+def aggregate_by_track(df: pd.DataFrame, **aggregations) -> pd.DataFrame:
+    """
+    Группирует строки по уникальным трекам с именованными агрегатами.
+
+    Ключи переводятся в category: каждая колонка хэшируется один раз,
+    дальше группировка идет по целочисленным кодам. Категории строятся из
+    отсортированных значений, поэтому порядок строк совпадает с обычным
+    groupby. После агрегации ключам возвращаются исходные типы.
+    """
+    key_dtypes = df[UNIQUE_TRACK_COLS].dtypes.to_dict()
+    categorical = df.astype({col: 'category' for col in UNIQUE_TRACK_COLS})
+    grouped = (categorical
+               .groupby(UNIQUE_TRACK_COLS, as_index=False, observed=True, sort=True)
+               .agg(**aggregations))
+    return grouped.astype(key_dtypes)
+
+
+def map_unique(series: pd.Series, func: Callable[[pd.Series], pd.Series], missing=None) -> pd.Series:
+    """
+    Применяет строковую операцию только к уникальным значениям колонки
+    и раскладывает результат обратно по строкам.
+
+    Args:
+        series: Исходная колонка
+        func: Операция над колонкой уникальных значений
+        missing: Значение для пропусков (NaN/None) в исходной колонке
+    """
+    codes, uniques = pd.factorize(series)
+    mapped = func(pd.Series(uniques, dtype=object)).to_numpy(dtype=object)
+    # Код -1 (пропуск) указывает на добавленный последним элемент missing
+    values = np.append(mapped, np.array([missing], dtype=object))
+    return pd.Series(values[codes], index=series.index)
+
+
+def _next_chunk(chunks: Iterator[pd.DataFrame]) -> Optional[pd.DataFrame]:
+    """Читает следующую часть файла или возвращает None в конце"""
+    return next(chunks, None)
+
 
 class MusicFileProcessor:
     """Процессор для обработки музыкальных файлов"""
     
-    def __init__(self):
+    def __init__(self, frame_rate: Optional[float] = None):
+        """
+        Args:
+            frame_rate: Делитель номера кадра во временных метках
+                (по умолчанию config.TIMECODE_FRAME_RATE или 100)
+        """
         self.logger = logging.getLogger(__name__)
+        self.frame_rate = frame_rate if frame_rate is not None else default_frame_rate()
         
     def read_input(self, input_path: str) -> pd.DataFrame:
         """Читает входной CSV файл"""
@@ -24,6 +83,16 @@ class MusicFileProcessor:
             names=config.INPUT_COLUMNS
         )
     
+    def read_input_chunks(self, input_path: str, chunksize: int) -> Iterator[pd.DataFrame]:
+        """Читает входной CSV файл частями по chunksize строк"""
+        return pd.read_csv(
+            input_path,
+            sep=config.CSV_SEPARATOR,
+            header=None,
+            names=config.INPUT_COLUMNS,
+            chunksize=chunksize
+        )
+    
     def parse_filename(self, filename: str) -> tuple[str, str, str]:
         """
         Парсит имя файла и извлекает информацию о треке.
@@ -47,9 +116,23 @@ class MusicFileProcessor:
             return None, None, None
     
     def parse_tracks(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Извлекает информацию о треках из имен файлов"""
-        parsed_cols = df['original_string'].apply(lambda x: pd.Series(self.parse_filename(x)))
-        parsed_cols.columns = ['ID', 'Title', 'Artist']
+        """
+        Извлекает информацию о треках из имен файлов.
+
+        Векторизованный аналог parse_filename: одно регулярное выражение
+        на всю колонку вместо создания pd.Series для каждой строки.
+        """
+        # Нестроковые значения (NaN, числа) не содержат '_' и дают None,
+        # как и в parse_filename
+        names = df['original_string'].astype('string')
+        main_part = names.str.split('.mp3', n=1, regex=False).str[0]
+        parsed_cols = main_part.str.extract(FILENAME_PATTERN)
+
+        for col in ('Title', 'Artist'):
+            parsed_cols[col] = parsed_cols[col].str.replace('-', ' ', regex=False).str.title()
+
+        parsed_cols = parsed_cols.astype(object)
+        parsed_cols = parsed_cols.where(parsed_cols.notna(), None).reset_index(drop=True)
         return pd.concat([parsed_cols, df[['timestamp', 'series_number']].reset_index(drop=True)], axis=1)
     
     def clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -62,13 +145,14 @@ class MusicFileProcessor:
             df.loc[fix_mask, 'Title'] = split_id[1].str.replace('-', ' ').str.title()
         
         # Очистка имен исполнителей
-        df['Artist'] = df['Artist'].str.replace(config.ARTIST_CLEANUP_PATTERN, '', regex=True).str.strip()
+        cleanup_regex = artist_cleanup_regex()
+        df['Artist'] = map_unique(
+            df['Artist'],
+            lambda artists: artists.str.replace(cleanup_regex, '', regex=True).str.strip()
+        )
         
         # Конвертация временных меток
-        time_parts = df['timestamp'].astype(str).str.split(':', expand=True)
-        time_parts = time_parts.apply(pd.to_numeric, errors='coerce').fillna(0)
-        total_seconds = (time_parts[0] * 3600 + time_parts[1] * 60 + 
-                        time_parts[2] + time_parts[3] / 100.0)
+        total_seconds = timecode_to_seconds(df['timestamp'], self.frame_rate)
         df['duration_seconds'] = total_seconds.round().astype(int)
         
         # Форматирование ID и кодов библиотеки
@@ -84,65 +168,198 @@ class MusicFileProcessor:
         final_cols = ['ID', 'library_code', 'Title', 'Artist', 'duration_seconds', 'series_number']
         df = df[final_cols]
         
-        # Группировка уникальных треков
-        unique_track_cols = ['ID', 'library_code', 'Title', 'Artist', 'series_number']
-        aggregations = {'duration_seconds': 'sum'}
-        
-        deduped_df = df.groupby(unique_track_cols, as_index=False).agg(aggregations)
-        
-        # Подсчет повторений
-        counts = df.groupby(unique_track_cols).size().reset_index(name='repeat_count')
-        return pd.merge(deduped_df, counts, on=unique_track_cols)
+        # Сумма длительностей и число повторений за один проход группировки
+        return aggregate_by_track(
+            df,
+            duration_seconds=('duration_seconds', 'sum'),
+            repeat_count=('duration_seconds', 'size')
+        )
+    
+    def merge_duplicates(self, frames: List[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Объединяет частичные результаты process_duplicates.
+
+        Длительности и количество повторов суммируются по уникальным трекам,
+        поэтому результат совпадает с process_duplicates по всему файлу.
+        """
+        combined = pd.concat(frames, ignore_index=True)
+        return aggregate_by_track(
+            combined,
+            duration_seconds=('duration_seconds', 'sum'),
+            repeat_count=('repeat_count', 'sum')
+        )
+    
+    def process_chunks(self, input_path: str, chunksize: int,
+                       stages: Optional[List[StageMetrics]] = None) -> Tuple[pd.DataFrame, int]:
+        """
+        Потоковая обработка файла частями.
+
+        Каждая часть проходит parse_tracks → clean_data → process_duplicates,
+        после чего сливается с накопленным результатом. В памяти держится
+        одна часть входа и таблица уникальных треков.
+
+        Returns:
+            tuple: (агрегированные треки, количество прочитанных строк)
+        """
+        aggregated = None
+        total_rows = 0
+        with self.read_input_chunks(input_path, chunksize) as chunks:
+            while True:
+                chunk = self._stage(chunks, _next_chunk, stages, name='read_input')
+                if chunk is None:
+                    break
+                total_rows += len(chunk)
+                partial = (chunk
+                           .pipe(self._stage, self.parse_tracks, stages)
+                           .pipe(self._stage, self.clean_data, stages)
+                           .pipe(self._stage, self.process_duplicates, stages))
+                if aggregated is None:
+                    aggregated = partial
+                else:
+                    aggregated = self._stage([aggregated, partial], self.merge_duplicates, stages)
+        return aggregated, total_rows
     
     def filter_tracks(self, df: pd.DataFrame) -> pd.DataFrame:
         """Фильтрует треки по длительности и названию"""
         duration_mask = df['duration_seconds'] >= config.MINIMUM_DURATION
-        title_pattern = '|'.join(config.EXCLUDED_TITLES)
-        title_mask = ~df['Title'].str.contains(title_pattern, case=False, na=False)
+        title_regex = excluded_titles_regex()
+        excluded = map_unique(
+            df['Title'],
+            lambda titles: titles.str.contains(title_regex, na=False),
+            missing=False
+        ).astype(bool)
+        title_mask = ~excluded
         
         return df[duration_mask & title_mask].copy()
     
+    def _concatenate(self, df: pd.DataFrame) -> pd.Series:
+        """Строка "ID__Title__Artist" для каждого трека"""
+        return (df['ID'].astype(str) + '__' + df['Title'].astype(str) +
+                '__' + df['Artist'].astype(str))
+    
     def format_output(self, df: pd.DataFrame) -> pd.DataFrame:
         """Форматирует данные для вывода"""
         df['duration_seconds'] = df['duration_seconds'].astype(str) + ' сек'
-        df['Concatenated'] = df.apply(
-            lambda row: f"{row['ID']}__{row['Title']}__{row['Artist']}", axis=1
-        )
+        df['Concatenated'] = self._concatenate(df)
         df[''] = ''  # Добавляем пустую колонку
         return df[config.OUTPUT_COLUMNS]
     
-    def save_output(self, df: pd.DataFrame, output_path: str) -> None:
-        """Сохраняет результат в CSV файл"""
-        df.to_csv(
-            output_path,
-            index=False,
-            sep=config.CSV_SEPARATOR,
-            encoding=config.CSV_ENCODING
-        )
+    def format_output_columnar(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Форматирует данные для Parquet/Arrow: длительность остается числом,
+        library_code и Artist хранятся как category, пустая колонка не нужна.
+        """
+        df['Concatenated'] = self._concatenate(df)
+        df['library_code'] = df['library_code'].astype('category')
+        df['Artist'] = df['Artist'].astype('category')
+        return df[[col for col in config.OUTPUT_COLUMNS if col]].reset_index(drop=True)
     
-    def process_file(self, input_path: str, output_path: str) -> None:
-        """Обрабатывает один файл"""
+    def save_output(self, df: pd.DataFrame, output_path: str,
+                    output_format: str = 'csv') -> None:
+        """Сохраняет результат в CSV, Parquet или Arrow IPC файл"""
+        if output_format == 'parquet':
+            df.to_parquet(output_path, index=False)
+        elif output_format == 'arrow':
+            # Без сжатия файл можно читать через memory-map
+            df.to_feather(output_path, compression='uncompressed')
+        else:
+            df.to_csv(
+                output_path,
+                index=False,
+                sep=config.CSV_SEPARATOR,
+                encoding=config.CSV_ENCODING
+            )
+    
+    def _stage(self, data, func: Callable, stages: Optional[List[StageMetrics]],
+               *args, name: Optional[str] = None):
+        """
+        Выполняет этап конвейера. Если передан список stages, замеряет
+        время, количество строк на входе и выходе и память результата.
+        """
+        if stages is None:
+            return func(data, *args)
+        
+        if isinstance(data, pd.DataFrame):
+            rows_in = len(data)
+        elif isinstance(data, list):
+            rows_in = sum(len(frame) for frame in data)
+        else:
+            rows_in = 0
+        
+        started = time.perf_counter()
+        output = func(data, *args)
+        elapsed = time.perf_counter() - started
+        
+        # Для этапов без результата (сохранение) меряем входные данные
+        frame = output if output is not None else data
+        if isinstance(frame, pd.DataFrame):
+            rows_out = len(frame)
+            memory = int(frame.memory_usage(deep=True).sum())
+        else:
+            rows_out = memory = 0
+        add_stage(stages, name or func.__name__, elapsed, rows_in, rows_out, memory)
+        return output
+    
+    def process_file(self, input_path: str, output_path: str,
+                     chunksize: Optional[int] = None,
+                     collect_metrics: bool = False,
+                     output_format: str = 'csv',
+                     keep_aggregated: bool = False) -> ProcessResult:
+        """
+        Обрабатывает один файл.
+
+        Args:
+            input_path: Путь к входному CSV
+            output_path: Путь к результату
+            chunksize: Если задан, файл читается потоково частями по chunksize строк
+            collect_metrics: Замерять время, строки и память по этапам
+            output_format: Формат результата: 'csv', 'parquet' или 'arrow'
+            keep_aggregated: Вернуть в result.aggregated таблицу после
+                process_duplicates (для сводного отчета)
+
+        Returns:
+            ProcessResult: Итог обработки; ошибки логируются и не пробрасываются
+        """
+        result = ProcessResult(input_path, output_path, success=False)
+        stages = result.stages if collect_metrics else None
+        format_output = self.format_output if output_format == 'csv' else self.format_output_columnar
         try:
             self.logger.info(f"Начало обработки файла: {input_path}")
             
-            df = self.read_input(input_path)
-            initial_rows = len(df)
+            if chunksize:
+                aggregated_df, initial_rows = self.process_chunks(input_path, chunksize, stages)
+            else:
+                df = self._stage(input_path, self.read_input, stages)
+                initial_rows = len(df)
+                
+                aggregated_df = (df
+                               .pipe(self._stage, self.parse_tracks, stages)
+                               .pipe(self._stage, self.clean_data, stages)
+                               .pipe(self._stage, self.process_duplicates, stages))
             
-            processed_df = (df
-                          .pipe(self.parse_tracks)
-                          .pipe(self.clean_data)
-                          .pipe(self.process_duplicates)
-                          .pipe(self.filter_tracks)
-                          .pipe(self.format_output))
+            processed_df = (aggregated_df
+                          .pipe(self._stage, self.filter_tracks, stages)
+                          .pipe(self._stage, format_output, stages))
             
-            self.save_output(processed_df, output_path)
+            self._stage(processed_df, self.save_output, stages, output_path, output_format)
+            result.rows_in = initial_rows
+            result.rows_out = len(processed_df)
+            result.success = True
+            if keep_aggregated:
+                result.aggregated = aggregated_df
             
             self.logger.info(
                 f"Обработан: {os.path.basename(input_path)} → {os.path.basename(output_path)} | "
                 f"Удалено {initial_rows - len(processed_df)} треков по фильтру."
             )
+            if collect_metrics:
+                log_stages(result)
             
         except FileNotFoundError:
             self.logger.error(f"Ошибка: файл не найден {input_path}")
+            result.error = "файл не найден"
         except Exception as e:
             self.logger.error(f"Ошибка при обработке {input_path}: {e}")
+            result.error = str(e)
+        
+        return result
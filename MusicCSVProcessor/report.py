@@ -0,0 +1,83 @@
+"""
+Сводный отчет по всем обработанным файлам папки.
+
+Таблицы после process_duplicates из каждого файла сливаются в памяти по
+мере обработки, без повторного чтения результатов. Частичные таблицы
+накапливаются пачками и сворачиваются по уникальным трекам, поэтому
+память зависит от числа уникальных пар (трек, серия), а не от числа файлов.
+"""
+import logging
+from typing import List, Optional
+
+import pandas as pd
+
+import config
+from processor import MusicFileProcessor, aggregate_by_track
+
+TOTAL_KEYS = ['ID', 'library_code']
+SORT_KEYS = ['ID', 'library_code', 'series_number', 'Title', 'Artist']
+
+
+class ConsolidatedReport:
+    """Сводная таблица длительностей и повторов по сериям и в целом"""
+
+    def __init__(self, processor: MusicFileProcessor, merge_every: int = 50):
+        """
+        Args:
+            processor: Процессор, фильтр которого применяется к сводной таблице
+            merge_every: Сколько таблиц накапливать перед сворачиванием
+        """
+        self.processor = processor
+        self.merge_every = merge_every
+        self.files = 0
+        self.logger = logging.getLogger(__name__)
+        self._aggregated: Optional[pd.DataFrame] = None
+        self._pending: List[pd.DataFrame] = []
+
+    def add(self, aggregated: pd.DataFrame) -> None:
+        """Добавляет таблицу process_duplicates одного файла"""
+        self._pending.append(aggregated)
+        self.files += 1
+        if len(self._pending) >= self.merge_every:
+            self._merge()
+
+    def _merge(self) -> None:
+        frames = self._pending if self._aggregated is None else [self._aggregated] + self._pending
+        self._pending = []
+        if not frames:
+            return
+        self._aggregated = aggregate_by_track(
+            pd.concat(frames, ignore_index=True),
+            duration_seconds=('duration_seconds', 'sum'),
+            repeat_count=('repeat_count', 'sum')
+        )
+
+    def build(self) -> pd.DataFrame:
+        """
+        Строит итоговую таблицу: строка на трек и серию с длительностью и
+        повторами в серии, плюс итоги по ID/library_code во всех сериях.
+        К строкам применяется тот же фильтр, что и к файлам _edit.
+        """
+        self._merge()
+        if self._aggregated is None:
+            return pd.DataFrame()
+
+        report = self.processor.filter_tracks(self._aggregated)
+        totals = report.groupby(TOTAL_KEYS)[['duration_seconds', 'repeat_count']].transform('sum')
+        report['total_duration_seconds'] = totals['duration_seconds']
+        report['total_repeat_count'] = totals['repeat_count']
+        return report.sort_values(SORT_KEYS, ignore_index=True)
+
+    def save(self, output_path: str) -> pd.DataFrame:
+        """Строит и сохраняет сводный отчет в CSV"""
+        report = self.build()
+        report.to_csv(
+            output_path,
+            index=False,
+            sep=config.CSV_SEPARATOR,
+            encoding=config.CSV_ENCODING
+        )
+        self.logger.info(
+            f"Сводный отчет по {self.files} файлам ({len(report)} строк) сохранен в {output_path}"
+        )
+        return report
@@ -0,0 +1,97 @@
+"""
+Тесты движков обработки: LiteFileProcessor пишет тот же CSV, что и MusicFileProcessor.
+"""
+import csv
+
+import pytest
+
+import config
+from lite import LiteFileProcessor
+from processor import MusicFileProcessor
+from timecode import timecode_value_to_seconds, timecode_to_seconds
+from benchmark.generator import generate_input
+
+# (original_string, timestamp, series_number)
+EDGE_ROWS = [
+    ('A001_kpm_000001_morning-light_city-drive.mp3', '00:00:10:00', '1'),
+    ('A002_kpm_000001_morning-light_city-drive.mp3', '00:00:07:50', '1'),
+    ('A003_kpm_000001_morning-light_city-drive.mp3', '00:00:07:50', '2'),
+    # ID с '__' исправляется clean_data
+    ('A004_apm_000002__dark-river_echo-mix_storm.mp3', '00:01:00:00', '1'),
+    # Исключаемое название и очистка исполнителя
+    ('A005_ed_000003_blue-intro_night.mp3', '00:00:30:00', '1'),
+    ('A006_ed_000004_gold_sky-feat-pulse.mp3', '00:00:30:00', '1'),
+    # Некорректные метки: нечисловые и отсутствующие части считаются нулем
+    ('A007_uppm_000005_wild_heart.mp3', '00:xx:10', '1'),
+    ('A008_uppm_000006_wild_motion.mp3', '0:0:12', '1'),
+    ('A009_uppm_000007_fire_road.mp3', '00:00:1_0:00', '1'),
+    ('A010_uppm_000008_fire_ocean.mp3', '00:00:١٢:00', '1'),
+    ('A011_uppm_000009_fire_glass.mp3', '00:00:1e1:00', '1'),
+    ('A012_uppm_000010_fire_summer.mp3', '00:00: 20 :00', '1'),
+    ('A013_uppm_000011_fire_shadow.mp3', '00:00:nan:00', '1'),
+    ('A014_uppm_000012_fire_silver.mp3', '00:00:0x10:00', '1'),
+    ('A015_uppm_000013_fire_dream.mp3', '00:00:15.5:00', '1'),
+    ('A016_uppm_000014_fire_light.mp3', '', '1'),
+    # Имена, которые не разбираются
+    ('clip.mp3', '00:00:20:00', '1'),
+    ('', '00:00:20:00', '1'),
+    # Пустой номер серии
+    ('A017_koka_000015_pulse_echo.mp3', '00:00:20:00', ''),
+]
+
+# Номера серий, которые pandas читает как числа или оставляет строками
+SERIES_VALUES = [' 2', '2\t', '1.5', '1_0', '١', '1e1', 'x']
+
+
+def _write_rows(path, rows):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, delimiter=config.CSV_SEPARATOR)
+        for original_string, timestamp, series_number in rows:
+            values = {'original_string': original_string, 'timestamp': timestamp,
+                      'series_number': series_number}
+            writer.writerow([values.get(col, '') for col in config.INPUT_COLUMNS])
+
+
+def _outputs(tmp_path, input_path):
+    outputs = {}
+    for name, processor in (('pandas', MusicFileProcessor()), ('lite', LiteFileProcessor())):
+        output_path = tmp_path / f"{name}.csv"
+        result = processor.process_file(str(input_path), str(output_path))
+        assert result.success, result.error
+        outputs[name] = output_path.read_bytes()
+    return outputs
+
+
+def test_engines_match_on_edge_cases(tmp_path):
+    input_path = tmp_path / 'edge.csv'
+    _write_rows(input_path, EDGE_ROWS)
+    outputs = _outputs(tmp_path, input_path)
+    assert outputs['lite'] == outputs['pandas']
+
+
+@pytest.mark.parametrize('series_number', SERIES_VALUES)
+def test_engines_match_on_series_numbers(tmp_path, series_number):
+    input_path = tmp_path / 'series.csv'
+    _write_rows(input_path, [(name, timestamp, series_number) for name, timestamp, _ in EDGE_ROWS[:6]]
+                + EDGE_ROWS[6:])
+    outputs = _outputs(tmp_path, input_path)
+    assert outputs['lite'] == outputs['pandas']
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_engines_match_on_synthetic_input(tmp_path, seed):
+    input_path = tmp_path / 'synthetic.csv'
+    generate_input(str(input_path), 2000, malformed_rate=0.02, seed=seed)
+    outputs = _outputs(tmp_path, input_path)
+    assert outputs['lite'] == outputs['pandas']
+
+
+@pytest.mark.parametrize('value', [
+    '00:00:10:00', '00:00:1_0:00', '00:00:١٢:00', '00:00:1e1:00', '00:00: 20 :00',
+    '00:00:nan:00', '00:00:inf:00', '00:00:0x10:00', '00:00:+5:00', '00:00:.5:00', '1:2', '',
+])
+def test_timecode_value_matches_vectorized(value):
+    import pandas as pd
+
+    expected = timecode_to_seconds(pd.Series([value]), frame_rate=100).iloc[0]
+    assert timecode_value_to_seconds(value, frame_rate=100) == expected
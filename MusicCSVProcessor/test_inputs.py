@@ -0,0 +1,26 @@
+"""
+Тесты выбора входных файлов: результаты, отчет и замеры входами не считаются.
+"""
+from inputs import list_input_files
+from watcher import FolderWatcher
+
+
+def _touch(folder, *names):
+    for name in names:
+        (folder / name).write_text('a;b\n', encoding='utf-8')
+
+
+def test_outputs_report_and_metrics_are_not_inputs(tmp_path):
+    _touch(tmp_path, 'tracks.csv', 'tracks_edit.csv', 'consolidated_report.csv',
+           'metrics_20260101_120000.csv', 'report.csv')
+
+    assert list_input_files(str(tmp_path)) == [str(tmp_path / 'report.csv'), str(tmp_path / 'tracks.csv')]
+    assert list_input_files(str(tmp_path), exclude=[str(tmp_path / 'report.csv')]) == [str(tmp_path / 'tracks.csv')]
+
+
+def test_watcher_skips_metrics_file(tmp_path):
+    _touch(tmp_path, 'tracks.csv', 'report.csv')
+    watcher = FolderWatcher(str(tmp_path), settle_seconds=0, exclude=[str(tmp_path / 'report.csv')])
+
+    watcher.poll()
+    assert watcher.poll() == [str(tmp_path / 'tracks.csv')]
@@ -0,0 +1,81 @@
+"""
+Тесты MusicFileProcessor: векторный разбор имен файлов совпадает с parse_filename.
+"""
+import math
+
+import pandas as pd
+import pytest
+
+from processor import MusicFileProcessor
+
+FILENAMES = [
+    # Обычные имена
+    'LIB_12345_my-song_the-artist.mp3',
+    'LIB_12345_My-Song_The-Artist.mp3',
+    # ID с '_' и '__'
+    'LIB_12_34_title_artist.mp3',
+    'LIB__12__title_artist.mp3',
+    'LIB___title_artist.mp3',
+    '_ID_title_artist.mp3',
+    # Меньше 4 частей
+    'title_artist.mp3',
+    'LIB_title_artist.mp3',
+    'no-underscores.mp3',
+    '',
+    # Без .mp3 и с .mp3 в середине
+    'LIB_1_title_artist',
+    'LIB_1_title_artist.wav',
+    'LIB_1_title.mp3_artist.mp3',
+    'LIB_1_title_artist.mp3.bak',
+    'LIB_1_title_.mp3',
+    # Пробелы, перевод строки, не-ASCII
+    ' LIB_1_title_artist .mp3',
+    'LIB_1_tit\nle_art-ist.mp3',
+    'БИБ_7_песня-про-лето_исполнитель.mp3',
+    'LIB_1_o\'neil-song_mc-hammer.mp3',
+]
+
+NON_STRINGS = [float('nan'), None, 123, 4.5]
+
+
+def _as_tuple(row):
+    return tuple(None if value is None or (isinstance(value, float) and math.isnan(value)) else value
+                 for value in row)
+
+
+@pytest.fixture
+def processor():
+    return MusicFileProcessor(frame_rate=100)
+
+
+def _frame(values):
+    return pd.DataFrame({
+        'original_string': pd.Series(values, dtype=object),
+        'timestamp': ['00:00:10:00'] * len(values),
+        'series_number': [1] * len(values),
+    })
+
+
+@pytest.mark.parametrize('filename', FILENAMES + NON_STRINGS)
+def test_parse_tracks_matches_parse_filename(processor, filename):
+    parsed = processor.parse_tracks(_frame([filename]))
+    row = parsed[['ID', 'Title', 'Artist']].iloc[0].tolist()
+    assert _as_tuple(row) == processor.parse_filename(filename)
+
+
+def test_parse_tracks_whole_column(processor):
+    values = FILENAMES + NON_STRINGS
+    parsed = processor.parse_tracks(_frame(values))
+
+    expected = [processor.parse_filename(v) for v in values]
+    assert [_as_tuple(row) for row in parsed[['ID', 'Title', 'Artist']].itertuples(index=False)] == expected
+    assert parsed['timestamp'].tolist() == ['00:00:10:00'] * len(values)
+    assert parsed['series_number'].tolist() == [1] * len(values)
+
+
+def test_parse_tracks_resets_index(processor):
+    df = _frame(['LIB_1_a_b.mp3', 'LIB_2_c_d.mp3'])
+    df.index = [10, 20]
+    parsed = processor.parse_tracks(df)
+    assert parsed.index.tolist() == [0, 1]
+    assert parsed['ID'].tolist() == ['1', '2']
@@ -0,0 +1,110 @@
+"""
+Быстрый перевод временных меток "HH:MM:SS:FF" в секунды.
+
+Модуль используется и облегченным движком без pandas, поэтому numpy и
+pandas импортируются только в векторной функции.
+"""
+import re
+import math
+from typing import Optional
+
+import config
+
+# Делитель для номера кадра. Исторически кадры делились на 100;
+# для таймкода 25 fps задайте в config.py TIMECODE_FRAME_RATE = 25
+DEFAULT_FRAME_RATE = 100
+
+# Метка строго вида "HH:MM:SS:FF" из ASCII-цифр
+WELL_FORMED_PATTERN = r'[0-9]{2}:[0-9]{2}:[0-9]{2}:[0-9]{2}'
+TIMECODE_LENGTH = 11
+
+# Части метки, которые pd.to_numeric принимает за число: ASCII-цифры,
+# десятичная точка, порядок, inf/nan и пробельные символы по краям.
+# float() допускает больше ('1_0', не-ASCII цифры), поэтому проверяем заранее
+NUMBER_PATTERN = re.compile(
+    r'[ \t\n\r\v\f]*[+-]?(?:(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?|inf(?:inity)?|nan)[ \t\n\r\v\f]*',
+    re.IGNORECASE
+)
+
+
+def default_frame_rate() -> float:
+    """Делитель кадров из config.py или значение по умолчанию"""
+    return getattr(config, 'TIMECODE_FRAME_RATE', DEFAULT_FRAME_RATE)
+
+
+def _parse_well_formed(values, frame_rate: float):
+    """Разбирает метки фиксированной длины напрямую по байтам"""
+    import numpy as np
+
+    raw = ''.join(values).encode('ascii')
+    digits = np.frombuffer(raw, dtype=np.uint8).reshape(-1, TIMECODE_LENGTH).astype(np.int64) - ord('0')
+    hours = digits[:, 0] * 10 + digits[:, 1]
+    minutes = digits[:, 3] * 10 + digits[:, 4]
+    seconds = digits[:, 6] * 10 + digits[:, 7]
+    frames = digits[:, 9] * 10 + digits[:, 10]
+    return hours * 3600 + minutes * 60 + seconds + frames / frame_rate
+
+
+def _parse_irregular(values, frame_rate: float):
+    """
+    Разбирает прочие метки: части через ':' приводятся к числам,
+    нечисловые и отсутствующие части считаются нулем.
+    """
+    import pandas as pd
+
+    parts = values.str.split(':', expand=True).reindex(columns=range(4))
+    parts = parts.apply(pd.to_numeric, errors='coerce').fillna(0)
+    total = parts[0] * 3600 + parts[1] * 60 + parts[2] + parts[3] / frame_rate
+    return total.to_numpy(dtype=float)
+
+
+def timecode_to_seconds(values, frame_rate: float = None):
+    """
+    Переводит колонку временных меток (pd.Series) в секунды.
+
+    Корректные метки разбираются векторно по байтам, остальные (обычно
+    единицы строк) - через разбиение по ':' с приведением ошибок к нулю.
+
+    Args:
+        values: Колонка временных меток
+        frame_rate: Делитель для номера кадра (по умолчанию из config)
+
+    Returns:
+        pd.Series: Длительность в секундах (float) с индексом values
+    """
+    import numpy as np
+    import pandas as pd
+
+    if frame_rate is None:
+        frame_rate = default_frame_rate()
+
+    text = values.astype(str)
+    well_formed = text.str.fullmatch(WELL_FORMED_PATTERN).to_numpy(dtype=bool)
+    seconds = np.zeros(len(text), dtype=float)
+
+    if well_formed.any():
+        seconds[well_formed] = _parse_well_formed(text.to_numpy()[well_formed], frame_rate)
+    if not well_formed.all():
+        seconds[~well_formed] = _parse_irregular(text[~well_formed], frame_rate)
+
+    return pd.Series(seconds, index=values.index)
+
+
+def _part_to_number(part: str) -> float:
+    if not NUMBER_PATTERN.fullmatch(part):
+        return 0.0
+    number = float(part)
+    return 0.0 if math.isnan(number) else number
+
+
+def timecode_value_to_seconds(value: Optional[str], frame_rate: float = None) -> float:
+    """
+    Переводит одну временную метку в секунды по тем же правилам, что и
+    timecode_to_seconds: нечисловые и отсутствующие части считаются нулем.
+    """
+    if frame_rate is None:
+        frame_rate = default_frame_rate()
+    if value is None:
+        return 0.0
+    hours, minutes, seconds, frames = (_part_to_number(p) for p in (value.split(':') + [''] * 3)[:4])
+    return hours * 3600 + minutes * 60 + seconds + frames / frame_rate
@@ -0,0 +1,63 @@
+"""
+Наблюдение за папкой с входными CSV файлами.
+
+Папка опрашивается с заданным интервалом. Файл считается готовым к
+обработке, когда его размер и время изменения не меняются в течение
+settle_seconds — так недописанные файлы не попадают в обработку.
+"""
+import os
+import time
+from typing import Dict, Iterable, List, Tuple
+
+from inputs import list_input_files
+
+# (размер, время изменения в наносекундах)
+FileSignature = Tuple[int, int]
+
+
+class FolderWatcher:
+    """Отслеживает новые и измененные CSV файлы в папке"""
+
+    def __init__(self, folder: str, settle_seconds: float = 2.0, exclude: Iterable[str] = ()):
+        self.folder = folder
+        self.settle_seconds = settle_seconds
+        # Файлы папки, которые пишет сам скрипт (замеры)
+        self.exclude = list(exclude)
+        # Файлы, ожидающие окончания записи: путь → (подпись, момент последнего изменения)
+        self._pending: Dict[str, Tuple[FileSignature, float]] = {}
+        # Подписи уже отданных на обработку файлов
+        self._seen: Dict[str, FileSignature] = {}
+
+    def poll(self) -> List[str]:
+        """Возвращает файлы, которые появились или изменились и уже дописаны"""
+        now = time.monotonic()
+        ready = []
+        present = set()
+
+        for path in list_input_files(self.folder, self.exclude):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            present.add(path)
+            signature = (stat.st_size, stat.st_mtime_ns)
+            if self._seen.get(path) == signature:
+                continue
+
+            pending = self._pending.get(path)
+            if pending is None or pending[0] != signature:
+                self._pending[path] = (signature, now)
+            elif now - pending[1] >= self.settle_seconds:
+                del self._pending[path]
+                self._seen[path] = signature
+                ready.append(path)
+
+        # Забываем удаленные файлы
+        for path in list(self._pending):
+            if path not in present:
+                del self._pending[path]
+        for path in list(self._seen):
+            if path not in present:
+                del self._seen[path]
+
+        return sorted(ready)